@@ -5,9 +5,15 @@ Provides:
 - Admin authentication via Steam ID whitelist
 - User authentication via PAM Platform token validation
 """
-from typing import Optional
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import hmac
 import logging
+import secrets
 import httpx
+from cachetools import TTLCache
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from pydantic import BaseModel
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -153,7 +159,7 @@ async def get_current_user(
 
     Flow:
     1. Extract Bearer token from Authorization header
-    2. Validate token with PAM Platform GraphQL API
+    2. Validate token with PAM Platform GraphQL API (validate_token_with_pam)
     3. Return AuthenticatedUser if valid, None otherwise
 
     Args:
@@ -185,45 +191,145 @@ async def get_current_user(
 
         return None
 
-    token = credentials.credentials
+    return await validate_token_with_pam(credentials.credentials)
 
-    # Validate token with PAM Platform GraphQL API
+
+# Attempts per PAM validation when the request times out or cannot connect
+PAM_MAX_ATTEMPTS = 3
+
+# Shared PAM client: keeps connections alive instead of a new TCP/TLS handshake per request
+_pam_client: Optional[httpx.AsyncClient] = None
+
+# Per-process HMAC key for cache keys. The caches live in this process only,
+# so a random key needs no configuration and never leaves memory.
+_CACHE_KEY = secrets.token_bytes(32)
+
+
+def _token_fingerprint(token: str) -> str:
+    """HMAC-SHA256 of a token, used as cache key so raw tokens aren't kept around."""
+    return hmac.new(_CACHE_KEY, token.encode(), hashlib.sha256).hexdigest()
+
+
+# Validated users by token fingerprint. Bounded and expiring, so memory stays capped and
+# revoked tokens or changed tiers are picked up within AUTH_TOKEN_CACHE_TTL.
+# Only touched from the event loop, so no lock is needed.
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: "TTLCache[str, AuthenticatedUser]" = TTLCache(
+    maxsize=TOKEN_CACHE_MAX_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL
+)
+
+# In-flight PAM validations by token fingerprint, so concurrent requests share one call
+_inflight: Dict[str, "asyncio.Task[Optional[AuthenticatedUser]]"] = {}
+
+
+async def validate_token_with_pam(token: str) -> Optional[AuthenticatedUser]:
+    """
+    Validate a bearer token with PAM Platform.
+
+    Valid tokens are cached for AUTH_TOKEN_CACHE_TTL seconds. Concurrent
+    validations of the same token are coalesced: the first caller starts
+    the PAM request and everyone else awaits its result.
+
+    Args:
+        token: Bearer token from the Authorization header
+
+    Returns:
+        AuthenticatedUser if token is valid, None otherwise
+    """
+    key = _token_fingerprint(token)
+
+    user = _token_cache.get(key)
+    if user is not None:
+        return user
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_request_pam_validation(token))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield so one cancelled request doesn't cancel the shared validation
+    user = await asyncio.shield(task)
+
+    # Only successes are cached; failures may be transient PAM errors
+    if user is not None:
+        _token_cache[key] = user
+    return user
+
+
+def _get_pam_client() -> httpx.AsyncClient:
+    """Get or create the shared PAM Platform HTTP client."""
+    global _pam_client
+
+    if _pam_client is None:
+        _pam_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(float(settings.PAM_PLATFORM_TIMEOUT), connect=2.0),
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _pam_client
+
+
+async def close_pam_client():
+    """Close the shared PAM Platform HTTP client."""
+    global _pam_client
+
+    if _pam_client is not None:
+        try:
+            await _pam_client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing PAM Platform client: {e}")
+        finally:
+            _pam_client = None
+
+
+async def _request_pam_validation(token: str) -> Optional[AuthenticatedUser]:
+    """Call PAM Platform's GraphQL API to validate a token."""
     try:
-        async with httpx.AsyncClient(timeout=float(settings.PAM_PLATFORM_TIMEOUT)) as client:
-            response = await client.post(
-                f"{settings.PAM_PLATFORM_URL}/graphql",
-                json={
-                    "query": """
-                        query ValidateToken($token: String!) {
-                            validateToken(token: $token) {
-                                valid
-                                playerId
-                                steamId
-                                steamDisplayName
-                                tier
+        client = _get_pam_client()
+
+        # Retry transient network failures (not HTTP error statuses) so a
+        # brief PAM blip costs latency instead of logging the user out
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(PAM_MAX_ATTEMPTS),
+            wait=wait_exponential_jitter(initial=0.05, max=0.5),
+            retry=retry_if_exception_type((httpx.TimeoutException, httpx.ConnectError)),
+            reraise=True,
+        ):
+            with attempt:
+                response = await client.post(
+                    f"{settings.PAM_PLATFORM_URL}/graphql",
+                    json={
+                        "query": """
+                            query ValidateToken($token: String!) {
+                                validateToken(token: $token) {
+                                    valid
+                                    playerId
+                                    steamId
+                                    steamDisplayName
+                                    tier
+                                }
                             }
-                        }
-                    """,
-                    "variables": {"token": token}
-                },
-                headers={"Content-Type": "application/json"}
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                validation = data.get("data", {}).get("validateToken", {})
-
-                if validation.get("valid"):
-                    return AuthenticatedUser(
-                        player_id=validation["playerId"],
-                        steam_id=validation["steamId"],
-                        steam_display_name=validation.get("steamDisplayName"),
-                        tier=validation.get("tier", "free"),
-                    )
-                else:
-                    logger.debug("PAM Platform returned invalid token")
+                        """,
+                        "variables": {"token": token}
+                    },
+                    headers={"Content-Type": "application/json"}
+                )
+
+        if response.status_code == 200:
+            data = response.json()
+            validation = data.get("data", {}).get("validateToken", {})
+
+            if validation.get("valid"):
+                return AuthenticatedUser(
+                    player_id=validation["playerId"],
+                    steam_id=validation["steamId"],
+                    steam_display_name=validation.get("steamDisplayName"),
+                    tier=validation.get("tier", "free"),
+                )
             else:
-                logger.warning(f"PAM Platform returned status {response.status_code}")
+                logger.debug("PAM Platform returned invalid token")
+        else:
+            logger.warning(f"PAM Platform returned status {response.status_code}")
 
     except httpx.TimeoutException:
         logger.warning("PAM Platform token validation timed out")
@@ -6,7 +6,9 @@ Phase 2 (future): OAuth integration with Discord.
 """
 import secrets
 import hashlib
-from typing import Optional
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
 
 
 def generate_session_id() -> str:
@@ -28,6 +30,27 @@ def generate_build_id() -> str:
     return f"b_{random_part}"
 
 
+def generate_build_ids(count: int, db: Session) -> List[str]:
+    """
+    Generate `count` build IDs that are not already taken.
+
+    Candidates are checked against the builds table in one query per
+    round instead of one per ID; collisions are rare, so one round is
+    almost always enough.
+    """
+    from app.models.build import Build
+
+    build_ids: set = set()
+    while len(build_ids) < count:
+        candidates = {generate_build_id() for _ in range(count - len(build_ids))} - build_ids
+        taken = {
+            build_id for (build_id,) in
+            db.query(Build.build_id).filter(Build.build_id.in_(candidates)).all()
+        }
+        build_ids |= candidates - taken
+    return list(build_ids)
+
+
 def generate_feedback_id() -> str:
     """
     Generate a short feedback ID.
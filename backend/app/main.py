@@ -22,6 +22,7 @@ from app.core.config import settings
 from app.core.errors import APIError, api_error_handler, ValidationError
 from app.core.session import SessionMiddleware
 from app.core.cache import check_redis_health, close_redis, get_redis
+from app.core.auth import close_pam_client
 from app.core.rate_limit import limiter, rate_limit_exceeded_handler
 from app.core.business_metrics import metrics_update_loop
 from app.core.db_monitoring import setup_db_monitoring
@@ -390,3 +391,6 @@ async def shutdown_event():
     
     # Close Redis connection gracefully
     await close_redis()
+    
+    # Close the shared PAM Platform HTTP client
+    await close_pam_client()
@@ -15,7 +15,7 @@ class SearchAnalytics(Base):
     """
     __tablename__ = "search_analytics"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     # The search query
     query = Column(Text, nullable=False)
@@ -3,7 +3,7 @@ SQLAlchemy models for character builds and voting.
 """
 from sqlalchemy import (
     Boolean, Column, Integer, String, DateTime, Text, Float,
-    ForeignKey, UniqueConstraint, CheckConstraint
+    ForeignKey, UniqueConstraint, CheckConstraint, Index, text
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -33,7 +33,7 @@ class Build(Base):
     __tablename__ = "builds"
 
     # Primary key - use integer for internal operations, build_id for external
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     build_id = Column(String(12), unique=True, index=True, nullable=False)  # e.g., "b_abc12345"
 
     # Build details
@@ -48,7 +48,7 @@ class Build(Base):
     is_public = Column(Boolean, default=True, nullable=False)
     
     # Template flag - official starter builds that are read-only
-    is_template = Column(Boolean, default=False, nullable=False, index=True)
+    is_template = Column(Boolean, default=False, nullable=False)
 
     # Anonymous ownership (always set for all builds)
     session_id = Column(String(64), index=True, nullable=False)  # For anonymous users
@@ -72,6 +72,17 @@ class Build(Base):
     # Relationships
     votes = relationship("BuildVote", back_populates="build", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Partial index: only template rows are indexed (see migration 007)
+        Index(
+            "idx_builds_is_template",
+            "is_template",
+            postgresql_where=text("is_template = true"),
+            postgresql_include=["build_id", "name", "class_name"],
+            sqlite_where=text("is_template = 1"),
+        ),
+    )
+
     @property
     def avg_rating(self) -> float | None:
         """Calculate average rating from sum and count."""
@@ -108,7 +119,7 @@ class BuildVote(Base):
     """
     __tablename__ = "build_votes"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     build_id = Column(String(12), ForeignKey("builds.build_id", ondelete="CASCADE"), nullable=False)
 
     # Who voted - session_id for anonymous, player_id/steam_id for authenticated
@@ -16,7 +16,7 @@ class Feedback(Base):
     """
     __tablename__ = "feedback"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     feedback_id = Column(String(12), unique=True, index=True, nullable=False)  # e.g., "f_abc12345"
 
     # The query and response that was rated
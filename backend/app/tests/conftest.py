@@ -4,9 +4,11 @@ Provides test database, client, and session fixtures.
 """
 import os
 import pytest
-from typing import Generator
+from types import MappingProxyType
+from typing import AsyncGenerator, Callable, Generator, Mapping
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -18,12 +20,16 @@ from app.main import app
 from app.db.session import get_db
 from app.db.base_class import Base
 from app.models import *  # noqa: Import all models for table creation
+from app.models.analytics import SearchAnalytics
 
 
-# Test database URL (in-memory SQLite for speed, or PostgreSQL from CI services)
+# Test database URL (shared-cache in-memory SQLite for speed, or PostgreSQL from CI services).
+# The in-memory database is named per pytest-xdist worker ("gw0", "gw1", ...) so
+# parallel runs (`pytest -n auto --dist worksteal`) never share a database.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
 TEST_DATABASE_URL = os.environ.get(
     "TEST_DATABASE_URL",
-    "sqlite:///:memory:"
+    f"sqlite:///file:test_{_XDIST_WORKER}?mode=memory&cache=shared&uri=true"
 )
 
 # Create test engine
@@ -33,6 +39,26 @@ if "sqlite" in TEST_DATABASE_URL:
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune SQLite for a throwaway test database.
+
+        Also hands transaction control to SQLAlchemy so SAVEPOINTs work
+        with pysqlite (see the SQLAlchemy SQLite dialect docs).
+        """
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin_sqlite_transaction(conn):
+        """Emit our own BEGIN now that pysqlite no longer does."""
+        conn.exec_driver_sql("BEGIN")
 else:
     # PostgreSQL for CI environment
     engine = create_engine(TEST_DATABASE_URL)
@@ -40,24 +66,49 @@ else:
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db() -> Generator[Session, None, None]:
-    """Create a fresh database for each test."""
-    # Create all tables
+@pytest.fixture(scope="session")
+def db_schema() -> Generator[None, None, None]:
+    """Create all tables once for the whole test session."""
     Base.metadata.create_all(bind=engine)
-    
-    session = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db(db_schema: None) -> Generator[Session, None, None]:
+    """Provide a session isolated in a transaction that is rolled back after each test.
+
+    Commits made by the endpoints only release a SAVEPOINT, so nothing
+    outlives the test and the schema never has to be rebuilt.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )
     try:
         yield session
     finally:
         session.close()
-        # Drop all tables after test
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def _app_client() -> Generator[TestClient, None, None]:
+    """Start the app once per test session.
+
+    Entering TestClient runs the startup/shutdown handlers, so sharing it
+    avoids paying that cost for every test.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(scope="function")
-def client(db: Session) -> Generator[TestClient, None, None]:
-    """Create a test client with database dependency override."""
+def client(db: Session, _app_client: TestClient) -> Generator[TestClient, None, None]:
+    """Provide the shared test client with the database dependency overridden."""
     def override_get_db():
         try:
             yield db
@@ -66,22 +117,42 @@ def client(db: Session) -> Generator[TestClient, None, None]:
     
     app.dependency_overrides[get_db] = override_get_db
     
-    with TestClient(app) as test_client:
+    yield _app_client
+    
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+async def async_client(db: Session) -> AsyncGenerator[AsyncClient, None]:
+    """Create an async client that calls the ASGI app in-process.
+
+    Unlike TestClient there is no sync-to-async portal per request, and
+    requests can be awaited concurrently.
+    """
+    def override_get_db():
+        try:
+            yield db
+        finally:
+            pass
+    
+    app.dependency_overrides[get_db] = override_get_db
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as test_client:
         yield test_client
     
     app.dependency_overrides.clear()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def session_id() -> str:
     """Generate a test session ID."""
     return "sess_test123456789abc"
 
 
-@pytest.fixture
-def session_headers(session_id: str) -> dict:
-    """Headers with session ID."""
-    return {"X-Session-ID": session_id}
+@pytest.fixture(scope="module")
+def session_headers(session_id: str) -> Mapping[str, str]:
+    """Headers with session ID (read-only; copy with {**session_headers, ...} to extend)."""
+    return MappingProxyType({"X-Session-ID": session_id})
 
 
 @pytest.fixture
@@ -113,6 +184,22 @@ def sample_feedback_data() -> dict:
     }
 
 
+@pytest.fixture
+def make_feedback() -> Callable[..., dict]:
+    """Build a minimal valid feedback payload, with field overrides."""
+    base = {
+        "query": "Test query",
+        "response_snippet": "Test response",
+        "search_mode": "quick",
+        "rating": "up"
+    }
+    
+    def _make(**overrides) -> dict:
+        return {**base, **overrides}
+    
+    return _make
+
+
 @pytest.fixture
 def sample_analytics_data() -> dict:
     """Sample search analytics data for testing."""
@@ -121,3 +208,16 @@ def sample_analytics_data() -> dict:
         "search_mode": "deep",
         "result_count": 5
     }
+
+
+@pytest.fixture
+def seed_searches(db: Session) -> Callable[[list[dict]], None]:
+    """Insert search analytics rows directly, bypassing the HTTP stack.
+
+    Use for tests that only need data in place before hitting a read endpoint.
+    """
+    def _seed(rows: list[dict]) -> None:
+        db.bulk_insert_mappings(SearchAnalytics, rows)
+        db.commit()
+
+    return _seed
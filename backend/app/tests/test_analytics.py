@@ -3,6 +3,7 @@
 Covers search analytics recording and retrieval.
 """
 import pytest
+from typing import Callable
 from fastapi.testclient import TestClient
 
 
@@ -65,23 +66,13 @@ class TestPopularQueries:
         assert "queries" in data
         assert data["queries"] == []
     
-    def test_popular_queries_sorted(self, client: TestClient, session_headers: dict):
+    def test_popular_queries_sorted(self, client: TestClient, seed_searches: Callable):
         """Popular queries are sorted by frequency."""
-        # Record same query multiple times
-        for _ in range(5):
-            client.post(
-                "/api/v1/analytics/search",
-                json={"query": "popular query", "search_mode": "quick", "result_count": 10},
-                headers=session_headers
-            )
-        
-        # Record different query fewer times
-        for _ in range(2):
-            client.post(
-                "/api/v1/analytics/search",
-                json={"query": "less popular", "search_mode": "quick", "result_count": 5},
-                headers=session_headers
-            )
+        # Same query recorded more often than a different one
+        seed_searches(
+            [{"query": "popular query", "search_mode": "quick", "result_count": 10}] * 5
+            + [{"query": "less popular", "search_mode": "quick", "result_count": 5}] * 2
+        )
         
         response = client.get("/api/v1/analytics/popular-queries")
         
@@ -92,15 +83,13 @@ class TestPopularQueries:
         assert data["queries"][0]["query"] == "popular query"
         assert data["queries"][0]["count"] == 5
     
-    def test_popular_queries_limit(self, client: TestClient, session_headers: dict):
+    def test_popular_queries_limit(self, client: TestClient, seed_searches: Callable):
         """Popular queries respects limit parameter."""
         # Create many unique queries
-        for i in range(20):
-            client.post(
-                "/api/v1/analytics/search",
-                json={"query": f"query {i}", "search_mode": "quick", "result_count": 1},
-                headers=session_headers
-            )
+        seed_searches([
+            {"query": f"query {i}", "search_mode": "quick", "result_count": 1}
+            for i in range(20)
+        ])
         
         response = client.get("/api/v1/analytics/popular-queries?limit=5")
         
@@ -3,15 +3,18 @@
 Covers feedback submission and validation.
 """
 import pytest
+from typing import Callable
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
 
 class TestFeedbackSubmission:
     """Tests for feedback submission."""
     
-    def test_submit_feedback_success(self, client: TestClient, session_headers: dict, sample_feedback_data: dict):
+    @pytest.mark.asyncio
+    async def test_submit_feedback_success(self, async_client: AsyncClient, session_headers: dict, sample_feedback_data: dict):
         """Submitting feedback returns 201 and feedback ID."""
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/feedback",
             json=sample_feedback_data,
             headers=session_headers
@@ -23,34 +26,23 @@ class TestFeedbackSubmission:
         assert data["feedback_id"].startswith("f_")
         assert "received_at" in data
     
-    def test_submit_feedback_minimal(self, client: TestClient, session_headers: dict):
+    @pytest.mark.asyncio
+    async def test_submit_feedback_minimal(self, async_client: AsyncClient, session_headers: dict, make_feedback: Callable):
         """Feedback can be submitted with required fields only."""
-        minimal_data = {
-            "query": "How to craft?",
-            "response_snippet": "You need materials...",
-            "search_mode": "quick",
-            "rating": "down"
-        }
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/feedback",
-            json=minimal_data,
+            json=make_feedback(rating="down"),
             headers=session_headers
         )
         
         assert response.status_code == 201
     
-    def test_submit_feedback_with_comment(self, client: TestClient, session_headers: dict):
+    @pytest.mark.asyncio
+    async def test_submit_feedback_with_comment(self, async_client: AsyncClient, session_headers: dict, make_feedback: Callable):
         """Feedback can include optional comment."""
-        data = {
-            "query": "Best tank class?",
-            "response_snippet": "The Fighter/Tank is great...",
-            "search_mode": "smart",
-            "rating": "up",
-            "comment": "This was exactly what I needed!"
-        }
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/feedback",
-            json=data,
+            json=make_feedback(search_mode="smart", comment="This was exactly what I needed!"),
             headers=session_headers
         )
         
@@ -60,76 +52,32 @@ class TestFeedbackSubmission:
 class TestFeedbackValidation:
     """Tests for feedback validation."""
     
-    def test_invalid_rating_value(self, client: TestClient, session_headers: dict):
-        """Invalid rating values are rejected."""
-        data = {
-            "query": "Test query",
-            "response_snippet": "Test response",
-            "search_mode": "quick",
-            "rating": "invalid"
-        }
-        response = client.post(
-            "/api/v1/feedback",
-            json=data,
-            headers=session_headers
-        )
+    @pytest.mark.parametrize("overrides, missing_field", [
+        ({"rating": "invalid"}, None),
+        ({"search_mode": "turbo"}, None),
+        ({}, "query"),
+        ({}, "rating"),
+    ], ids=["invalid_rating", "invalid_search_mode", "missing_query", "missing_rating"])
+    def test_rejects_invalid_payload(self, client: TestClient, session_headers: dict, make_feedback: Callable, overrides: dict, missing_field: str):
+        """Invalid values and missing required fields are rejected."""
+        payload = make_feedback(**overrides)
+        if missing_field:
+            del payload[missing_field]
         
-        assert response.status_code == 422
-    
-    def test_invalid_search_mode(self, client: TestClient, session_headers: dict):
-        """Invalid search mode values are rejected."""
-        data = {
-            "query": "Test query",
-            "response_snippet": "Test response",
-            "search_mode": "turbo",  # Invalid mode
-            "rating": "up"
-        }
         response = client.post(
             "/api/v1/feedback",
-            json=data,
+            json=payload,
             headers=session_headers
         )
         
         assert response.status_code == 422
     
-    def test_missing_required_fields(self, client: TestClient, session_headers: dict):
-        """Missing required fields are rejected."""
-        # Missing query
-        response = client.post(
-            "/api/v1/feedback",
-            json={
-                "response_snippet": "Test",
-                "search_mode": "quick",
-                "rating": "up"
-            },
-            headers=session_headers
-        )
-        assert response.status_code == 422
-        
-        # Missing rating
-        response = client.post(
-            "/api/v1/feedback",
-            json={
-                "query": "Test",
-                "response_snippet": "Test",
-                "search_mode": "quick"
-            },
-            headers=session_headers
-        )
-        assert response.status_code == 422
-    
-    def test_response_snippet_truncation(self, client: TestClient, session_headers: dict):
+    def test_response_snippet_truncation(self, client: TestClient, session_headers: dict, make_feedback: Callable):
         """Long response snippets are accepted (truncated server-side)."""
         long_snippet = "x" * 1000  # Exceeds 500 char limit
-        data = {
-            "query": "Test query",
-            "response_snippet": long_snippet,
-            "search_mode": "deep",
-            "rating": "down"
-        }
         response = client.post(
             "/api/v1/feedback",
-            json=data,
+            json=make_feedback(response_snippet=long_snippet, search_mode="deep", rating="down"),
             headers=session_headers
         )
         
@@ -0,0 +1,46 @@
+"""Replace the is_template index with a partial covering index.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16
+
+Template lookups always filter on is_template = true, which matches only a
+handful of rows. A plain boolean index over every build has almost no
+selectivity; a partial index restricted to templates stays tiny and, with
+the listed columns included, answers the template listing index-only.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Swap idx_builds_is_template for a partial covering index."""
+    op.drop_index('idx_builds_is_template', table_name='builds')
+    
+    op.create_index(
+        'idx_builds_is_template',
+        'builds',
+        ['is_template'],
+        unique=False,
+        postgresql_where=sa.text('is_template = true'),
+        postgresql_include=['build_id', 'name', 'class_name'],
+        sqlite_where=sa.text('is_template = 1'),
+    )
+
+
+def downgrade():
+    """Restore the plain is_template index."""
+    op.drop_index('idx_builds_is_template', table_name='builds')
+    
+    op.create_index(
+        'idx_builds_is_template',
+        'builds',
+        ['is_template'],
+        unique=False
+    )
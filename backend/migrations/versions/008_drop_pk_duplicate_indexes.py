@@ -0,0 +1,37 @@
+"""Drop indexes that duplicate primary keys.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16
+
+Migrations 001-003 created an ix_<table>_id index on every primary key
+column. PRIMARY KEY already carries its own unique index, so these only
+add an extra B-tree write to every insert.
+"""
+from alembic import op
+
+# Revision identifiers
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# (index name, table) pairs duplicating the primary key
+PK_DUPLICATE_INDEXES = [
+    ('ix_builds_id', 'builds'),
+    ('ix_build_votes_id', 'build_votes'),
+    ('ix_feedback_id', 'feedback'),
+    ('ix_search_analytics_id', 'search_analytics'),
+]
+
+
+def upgrade():
+    """Drop the ix_*_id indexes."""
+    for index_name, table in PK_DUPLICATE_INDEXES:
+        op.drop_index(index_name, table_name=table)
+
+
+def downgrade():
+    """Recreate the ix_*_id indexes."""
+    for index_name, table in PK_DUPLICATE_INDEXES:
+        op.create_index(index_name, table, ['id'], unique=False)
@@ -0,0 +1,53 @@
+"""Seed the official template builds.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16
+
+Inserts the template builds as part of `alembic upgrade head`, which the
+entrypoint already runs, instead of a separate seed script invocation.
+The templates are defined once, in scripts/seed_templates.py, and
+inserted with its insert_templates(): class names are resolved from the
+archetypes and build IDs are checked against existing builds. Templates
+that already exist by name (e.g. seeded by the script) are skipped.
+
+Rows inserted here are owned by MIGRATION_SESSION_ID, so downgrade()
+removes exactly those and leaves templates that existed beforehand.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+# Revision identifiers
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+# Session ID marking the templates this migration inserted
+MIGRATION_SESSION_ID = 'system_template_009'
+
+builds_table = sa.table(
+    'builds',
+    sa.column('is_template', sa.Boolean),
+    sa.column('session_id', sa.String),
+)
+
+
+def upgrade():
+    """Insert template builds that are not already present."""
+    # Imported here so listing revisions doesn't load the app
+    from scripts.seed_templates import insert_templates
+    
+    # Runs inside the migration's transaction; alembic commits it
+    insert_templates(Session(bind=op.get_bind()), session_id=MIGRATION_SESSION_ID)
+
+
+def downgrade():
+    """Remove the template builds inserted by upgrade()."""
+    op.execute(
+        builds_table.delete().where(
+            builds_table.c.is_template == sa.true(),
+            builds_table.c.session_id == MIGRATION_SESSION_ID,
+        )
+    )
@@ -4,6 +4,10 @@
 This script creates official build templates for common archetypes.
 Templates are marked with is_template=True and cannot be modified by users.
 
+TEMPLATE_BUILDS is the only definition of the templates: migration 009
+inserts them with insert_templates() during `alembic upgrade head`, and
+this script re-seeds templates that were deleted afterwards.
+
 Usage:
     python -m scripts.seed_templates
 
@@ -13,169 +17,203 @@ Or via Docker:
 """
 import sys
 import os
+from dataclasses import dataclass, field
+from typing import List, Tuple
 
 # Add the backend directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
 from app.models.build import Build
-from app.core.security import generate_build_id
+from app.core.security import generate_build_ids
 from app.core.config import settings
 from app.game_constants.game_data import get_class_name
 
+
+@dataclass(frozen=True, slots=True)
+class TemplateSpec:
+    """An official template build; class_name is resolved from the archetypes."""
+    name: str
+    description: str
+    primary_archetype: str
+    secondary_archetype: str
+    race: str
+    class_name: str = field(init=False)
+    
+    def __post_init__(self):
+        # The templates are constants, so an invalid archetype combination
+        # is a bug in this file and fails at import, not mid-seed.
+        class_name = get_class_name(self.primary_archetype, self.secondary_archetype)
+        if not class_name:
+            raise ValueError(
+                f"Invalid archetype combination in template {self.name!r}: "
+                f"{self.primary_archetype} + {self.secondary_archetype}"
+            )
+        object.__setattr__(self, "class_name", class_name)
+
+
 # Template builds data
-TEMPLATE_BUILDS = [
+TEMPLATE_BUILDS: Tuple[TemplateSpec, ...] = (
     # Tank Templates
-    {
-        "name": "Classic Tank - Paladin",
-        "description": "A holy warrior combining the Tank's defensive capabilities with Cleric healing augments. Excels at sustaining damage while providing group support. Ideal for dungeon tanking and node sieges.",
-        "primary_archetype": "tank",
-        "secondary_archetype": "cleric",
-        "race": "kaelar",
-    },
-    {
-        "name": "Guardian Wall",
-        "description": "Pure defensive powerhouse. Double Tank archetype means maximum protection abilities and unmatched resilience. Perfect for castle siege defense and protecting key allies.",
-        "primary_archetype": "tank",
-        "secondary_archetype": "tank",
-        "race": "dunir",
-    },
+    TemplateSpec(
+        name="Classic Tank - Paladin",
+        description="A holy warrior combining the Tank's defensive capabilities with Cleric healing augments. Excels at sustaining damage while providing group support. Ideal for dungeon tanking and node sieges.",
+        primary_archetype="tank",
+        secondary_archetype="cleric",
+        race="kaelar",
+    ),
+    TemplateSpec(
+        name="Guardian Wall",
+        description="Pure defensive powerhouse. Double Tank archetype means maximum protection abilities and unmatched resilience. Perfect for castle siege defense and protecting key allies.",
+        primary_archetype="tank",
+        secondary_archetype="tank",
+        race="dunir",
+    ),
     # Healer Templates
-    {
-        "name": "Holy Healer - High Priest",
-        "description": "The ultimate healing specialist. Double Cleric archetype provides unmatched healing output and support capabilities. Essential for raid progression and large-scale PvP.",
-        "primary_archetype": "cleric",
-        "secondary_archetype": "cleric",
-        "race": "empyrean",
-    },
-    {
-        "name": "Battle Cleric - Templar",
-        "description": "A frontline healer who can hold their own in combat. Fighter secondary adds melee damage and survivability. Great for small group content and caravan runs.",
-        "primary_archetype": "cleric",
-        "secondary_archetype": "fighter",
-        "race": "vaelune",
-    },
+    TemplateSpec(
+        name="Holy Healer - High Priest",
+        description="The ultimate healing specialist. Double Cleric archetype provides unmatched healing output and support capabilities. Essential for raid progression and large-scale PvP.",
+        primary_archetype="cleric",
+        secondary_archetype="cleric",
+        race="empyrean",
+    ),
+    TemplateSpec(
+        name="Battle Cleric - Templar",
+        description="A frontline healer who can hold their own in combat. Fighter secondary adds melee damage and survivability. Great for small group content and caravan runs.",
+        primary_archetype="cleric",
+        secondary_archetype="fighter",
+        race="vaelune",
+    ),
     # DPS Templates (Melee)
-    {
-        "name": "Assassin - Silent Death",
-        "description": "Master of stealth and burst damage. Double Rogue archetype maximizes critical strikes and evasion. Perfect for PvP ganking and taking down high-value targets.",
-        "primary_archetype": "rogue",
-        "secondary_archetype": "rogue",
-        "race": "vek",
-    },
-    {
-        "name": "Weapon Master - Berserker",
-        "description": "Raw melee damage dealer. Double Fighter archetype provides versatile weapon skills and sustained DPS. Excellent for dungeon DPS and open-world farming.",
-        "primary_archetype": "fighter",
-        "secondary_archetype": "fighter",
-        "race": "renkai",
-    },
+    TemplateSpec(
+        name="Assassin - Silent Death",
+        description="Master of stealth and burst damage. Double Rogue archetype maximizes critical strikes and evasion. Perfect for PvP ganking and taking down high-value targets.",
+        primary_archetype="rogue",
+        secondary_archetype="rogue",
+        race="vek",
+    ),
+    TemplateSpec(
+        name="Weapon Master - Berserker",
+        description="Raw melee damage dealer. Double Fighter archetype provides versatile weapon skills and sustained DPS. Excellent for dungeon DPS and open-world farming.",
+        primary_archetype="fighter",
+        secondary_archetype="fighter",
+        race="renkai",
+    ),
     # DPS Templates (Ranged)
-    {
-        "name": "Archwizard - Elemental Master",
-        "description": "Pure magical destruction. Double Mage archetype delivers devastating AoE and single-target spells. Key role in sieges and dungeon boss encounters.",
-        "primary_archetype": "mage",
-        "secondary_archetype": "mage",
-        "race": "pyrai",
-    },
-    {
-        "name": "Hawkeye - Precision Archer",
-        "description": "Long-range physical damage specialist. Double Ranger archetype maximizes accuracy and mobility. Ideal for kiting, scouting, and ranged PvP.",
-        "primary_archetype": "ranger",
-        "secondary_archetype": "ranger",
-        "race": "nikua",
-    },
+    TemplateSpec(
+        name="Archwizard - Elemental Master",
+        description="Pure magical destruction. Double Mage archetype delivers devastating AoE and single-target spells. Key role in sieges and dungeon boss encounters.",
+        primary_archetype="mage",
+        secondary_archetype="mage",
+        race="pyrai",
+    ),
+    TemplateSpec(
+        name="Hawkeye - Precision Archer",
+        description="Long-range physical damage specialist. Double Ranger archetype maximizes accuracy and mobility. Ideal for kiting, scouting, and ranged PvP.",
+        primary_archetype="ranger",
+        secondary_archetype="ranger",
+        race="nikua",
+    ),
     # Support Templates
-    {
-        "name": "Minstrel - Group Buff Master",
-        "description": "Ultimate group support through music. Double Bard archetype provides powerful party-wide buffs and crowd control. Essential for organized group content.",
-        "primary_archetype": "bard",
-        "secondary_archetype": "bard",
-        "race": "tulnar",
-    },
-    {
-        "name": "Conjurer - Pet Army",
-        "description": "Command an army of summoned creatures. Double Summoner archetype maximizes pet power and variety. Great for solo content and overwhelming enemies with numbers.",
-        "primary_archetype": "summoner",
-        "secondary_archetype": "summoner",
-        "race": "empyrean",
-    },
+    TemplateSpec(
+        name="Minstrel - Group Buff Master",
+        description="Ultimate group support through music. Double Bard archetype provides powerful party-wide buffs and crowd control. Essential for organized group content.",
+        primary_archetype="bard",
+        secondary_archetype="bard",
+        race="tulnar",
+    ),
+    TemplateSpec(
+        name="Conjurer - Pet Army",
+        description="Command an army of summoned creatures. Double Summoner archetype maximizes pet power and variety. Great for solo content and overwhelming enemies with numbers.",
+        primary_archetype="summoner",
+        secondary_archetype="summoner",
+        race="empyrean",
+    ),
     # Hybrid Templates
-    {
-        "name": "Spellsword - Magic Warrior",
-        "description": "Blend of steel and sorcery. Fighter primary with Mage secondary creates a versatile melee combatant with magical augments. Flexible role for all content types.",
-        "primary_archetype": "fighter",
-        "secondary_archetype": "mage",
-        "race": "kaelar",
-    },
-    {
-        "name": "Shaman - Spiritual Guide",
-        "description": "Healer with summoning capabilities. Cleric primary with Summoner secondary provides healing plus spirit companions for extra utility. Unique support playstyle.",
-        "primary_archetype": "cleric",
-        "secondary_archetype": "summoner",
-        "race": "tulnar",
-    },
-]
+    TemplateSpec(
+        name="Spellsword - Magic Warrior",
+        description="Blend of steel and sorcery. Fighter primary with Mage secondary creates a versatile melee combatant with magical augments. Flexible role for all content types.",
+        primary_archetype="fighter",
+        secondary_archetype="mage",
+        race="kaelar",
+    ),
+    TemplateSpec(
+        name="Shaman - Spiritual Guide",
+        description="Healer with summoning capabilities. Cleric primary with Summoner secondary provides healing plus spirit companions for extra utility. Unique support playstyle.",
+        primary_archetype="cleric",
+        secondary_archetype="summoner",
+        race="tulnar",
+    ),
+)
+
+
+# Session ID that owns templates seeded by this script
+TEMPLATE_SESSION_ID = "system_template"
+
+
+def insert_templates(db: Session, session_id: str = TEMPLATE_SESSION_ID) -> List[str]:
+    """
+    Insert the templates that do not exist yet (by name), without committing.
+
+    Returns:
+        build_ids of the inserted templates
+    """
+    # One SELECT for every existing template name instead of one per template
+    existing_names = {
+        name for (name,) in db.query(Build.name).filter(Build.is_template == True).all()
+    }
+    new_templates = []
+    
+    for template_data in TEMPLATE_BUILDS:
+        if template_data.name in existing_names:
+            print(f"SKIP: Template already exists: {template_data.name}")
+            continue
+        
+        new_templates.append(template_data)
+        existing_names.add(template_data.name)
+    
+    # Allocate all build IDs up front with a single uniqueness check
+    build_ids = generate_build_ids(len(new_templates), db)
+    new_rows = []
+    
+    for template_data, build_id in zip(new_templates, build_ids):
+        new_rows.append({
+            "build_id": build_id,
+            "name": template_data.name,
+            "description": template_data.description,
+            "primary_archetype": template_data.primary_archetype,
+            "secondary_archetype": template_data.secondary_archetype,
+            "class_name": template_data.class_name,
+            "race": template_data.race,
+            "is_public": True,
+            "is_template": True,
+            "session_id": session_id,
+        })
+        print(f"CREATE: {template_data.name} ({template_data.class_name})")
+    
+    # Core executemany: on psycopg2 this is sent as multi-row
+    # INSERT ... VALUES batches, not one statement per template
+    if new_rows:
+        db.execute(insert(Build), new_rows)
+    return build_ids
 
 
 def seed_templates():
     """Seed template builds into the database."""
     # Create database engine
-    engine = create_engine(settings.DATABASE_URL)
+    engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
     SessionLocal = sessionmaker(bind=engine)
     db = SessionLocal()
     
     try:
-        created_count = 0
-        skipped_count = 0
-        
-        for template_data in TEMPLATE_BUILDS:
-            # Compute class name
-            class_name = get_class_name(
-                template_data["primary_archetype"],
-                template_data["secondary_archetype"]
-            )
-            
-            if not class_name:
-                print(f"ERROR: Invalid archetype combination: {template_data['primary_archetype']} + {template_data['secondary_archetype']}")
-                continue
-            
-            # Check if template with same name already exists
-            existing = db.query(Build).filter(
-                Build.name == template_data["name"],
-                Build.is_template == True
-            ).first()
-            
-            if existing:
-                print(f"SKIP: Template already exists: {template_data['name']}")
-                skipped_count += 1
-                continue
-            
-            # Create the template build
-            build = Build(
-                build_id=generate_build_id(),
-                name=template_data["name"],
-                description=template_data["description"],
-                primary_archetype=template_data["primary_archetype"],
-                secondary_archetype=template_data["secondary_archetype"],
-                class_name=class_name,
-                race=template_data["race"],
-                is_public=True,
-                is_template=True,
-                session_id="system_template",  # Special session for templates
-            )
-            
-            db.add(build)
-            print(f"CREATE: {template_data['name']} ({class_name})")
-            created_count += 1
-        
+        created_count = len(insert_templates(db))
         db.commit()
         
         print(f"\n=== Summary ===")
         print(f"Created: {created_count}")
-        print(f"Skipped: {skipped_count}")
-        print(f"Total templates: {created_count + skipped_count}")
+        print(f"Skipped: {len(TEMPLATE_BUILDS) - created_count}")
+        print(f"Total templates: {len(TEMPLATE_BUILDS)}")
         
     except Exception as e:
         db.rollback()
@@ -187,6 +225,6 @@ def seed_templates():
 
 if __name__ == "__main__":
     print("Seeding build templates...")
-    print(f"Database: {settings.DATABASE_URL[:50]}...")
+    print(f"Database: {settings.SQLALCHEMY_DATABASE_URI[:50]}...")
     print()
     seed_templates()
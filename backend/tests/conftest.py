@@ -2,7 +2,7 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -23,20 +23,63 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test."""
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune SQLite for a throwaway test database.
+
+    Also lets SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite.
+    """
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+@event.listens_for(engine, "begin")
+def _begin_sqlite_transaction(conn):
+    """Emit our own BEGIN now that pysqlite no longer does."""
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def db_schema():
+    """Create all tables once for the whole test session."""
     Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
+
+
+@pytest.fixture(scope="function")
+def db_session(db_schema):
+    """
+    Provide a session isolated in a transaction that is rolled back after each test.
+    
+    Endpoint commits only release a SAVEPOINT (join_transaction_mode), so no
+    data outlives the test and no DDL runs per test.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def _app_client():
+    """Start the app once; startup/shutdown run once per test session."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, _app_client):
     """Create test client with overridden database dependency."""
     def override_get_db():
         try:
@@ -45,8 +88,7 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
-        yield test_client
+    yield _app_client
     app.dependency_overrides.clear()
 
 
@@ -1,16 +1,26 @@
 """Tests for authentication module."""
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
+from cachetools import TTLCache
 
 from app.core.auth import (
     AuthenticatedUser,
     validate_token_with_pam,
     get_current_user,
-    require_auth,
-    get_creator_name,
+    _inflight,
     _token_cache,
 )
+from app.core.config import settings
+
+
+def pam_response(status_code=200, **validation):
+    """Mock PAM Platform GraphQL response for a validateToken query."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = {"data": {"validateToken": validation}}
+    return response
 
 
 class TestAuthenticatedUser:
@@ -52,32 +62,28 @@ class TestValidateTokenWithPam:
     
     @pytest.fixture(autouse=True)
     def clear_cache(self):
-        """Clear token cache before each test."""
+        """Clear token cache and in-flight validations before each test."""
         _token_cache.clear()
+        _inflight.clear()
         yield
         _token_cache.clear()
+        _inflight.clear()
     
     @pytest.mark.asyncio
     async def test_valid_token(self):
         """Should return AuthenticatedUser for valid token."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "valid": True,
-            "player_id": "player_123",
-            "steam_id": "76561198012345678",
-            "steam_display_name": "TestPlayer",
-            "email": "test@example.com",
-            "tier": "pro",
-        }
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post = AsyncMock(return_value=mock_response)
-            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_instance.__aexit__ = AsyncMock(return_value=None)
-            mock_client.return_value = mock_instance
-            
+        mock_response = pam_response(
+            valid=True,
+            playerId="player_123",
+            steamId="76561198012345678",
+            steamDisplayName="TestPlayer",
+            tier="pro",
+        )
+        
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=mock_response)
+        
+        with patch("app.core.auth._pam_client", mock_instance):
             user = await validate_token_with_pam("valid_token")
             
             assert user is not None
@@ -89,17 +95,12 @@ class TestValidateTokenWithPam:
     @pytest.mark.asyncio
     async def test_invalid_token(self):
         """Should return None for invalid token."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"valid": False}
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post = AsyncMock(return_value=mock_response)
-            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_instance.__aexit__ = AsyncMock(return_value=None)
-            mock_client.return_value = mock_instance
-            
+        mock_response = pam_response(valid=False)
+        
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=mock_response)
+        
+        with patch("app.core.auth._pam_client", mock_instance):
             user = await validate_token_with_pam("invalid_token")
             
             assert user is None
@@ -110,13 +111,10 @@ class TestValidateTokenWithPam:
         mock_response = MagicMock()
         mock_response.status_code = 401
         
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post = AsyncMock(return_value=mock_response)
-            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_instance.__aexit__ = AsyncMock(return_value=None)
-            mock_client.return_value = mock_instance
-            
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=mock_response)
+        
+        with patch("app.core.auth._pam_client", mock_instance):
             user = await validate_token_with_pam("unauthorized_token")
             
             assert user is None
@@ -124,36 +122,54 @@ class TestValidateTokenWithPam:
     @pytest.mark.asyncio
     async def test_timeout_error(self):
         """Should return None on timeout."""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post = AsyncMock(side_effect=httpx.TimeoutException("timeout"))
-            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_instance.__aexit__ = AsyncMock(return_value=None)
-            mock_client.return_value = mock_instance
-            
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=httpx.TimeoutException("timeout"))
+        
+        with patch("app.core.auth._pam_client", mock_instance):
             user = await validate_token_with_pam("timeout_token")
             
             assert user is None
+            assert mock_instance.post.call_count == 3  # Retried before giving up
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code", [401, 500])
+    async def test_error_status_not_retried(self, status_code):
+        """HTTP error statuses come from PAM itself, so they are not retried."""
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=pam_response(status_code=status_code))
+        
+        with patch("app.core.auth._pam_client", mock_instance):
+            user = await validate_token_with_pam("rejected_token")
+            
+            assert user is None
+            assert mock_instance.post.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_protocol_error_not_retried(self):
+        """Only timeouts and connect errors are retried, not other transport errors."""
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=httpx.RemoteProtocolError("bad response"))
+        
+        with patch("app.core.auth._pam_client", mock_instance):
+            user = await validate_token_with_pam("protocol_error_token")
+            
+            assert user is None
+            assert mock_instance.post.call_count == 1
     
     @pytest.mark.asyncio
     async def test_token_caching(self):
         """Should cache validated tokens."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "valid": True,
-            "player_id": "player_cached",
-            "steam_id": "76561198012345678",
-            "tier": "free",
-        }
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post = AsyncMock(return_value=mock_response)
-            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_instance.__aexit__ = AsyncMock(return_value=None)
-            mock_client.return_value = mock_instance
-            
+        mock_response = pam_response(
+            valid=True,
+            playerId="player_cached",
+            steamId="76561198012345678",
+            tier="free",
+        )
+        
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=mock_response)
+        
+        with patch("app.core.auth._pam_client", mock_instance):
             # First call - should call PAM
             user1 = await validate_token_with_pam("cached_token")
             assert mock_instance.post.call_count == 1
@@ -164,20 +180,75 @@ class TestValidateTokenWithPam:
             
             assert user1.player_id == user2.player_id
 
-
-class TestGetCreatorName:
-    """Tests for get_creator_name helper."""
     
-    def test_anonymous_user(self):
-        """Should return 'anonymous' for None user."""
-        assert get_creator_name(None) == "anonymous"
+    @pytest.mark.asyncio
+    async def test_cache_expires_after_ttl(self):
+        """A cached token is reused within AUTH_TOKEN_CACHE_TTL and revalidated after it."""
+        now = [0.0]
+        cache = TTLCache(maxsize=10, ttl=settings.AUTH_TOKEN_CACHE_TTL, timer=lambda: now[0])
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=pam_response(
+            valid=True, playerId="player_ttl", steamId="76561198012345678",
+        ))
+        
+        with patch("app.core.auth._pam_client", mock_instance), \
+                patch("app.core.auth._token_cache", cache):
+            await validate_token_with_pam("ttl_token")
+            
+            now[0] = settings.AUTH_TOKEN_CACHE_TTL - 1
+            await validate_token_with_pam("ttl_token")
+            assert mock_instance.post.call_count == 1
+            
+            now[0] = settings.AUTH_TOKEN_CACHE_TTL + 1
+            await validate_token_with_pam("ttl_token")
+            assert mock_instance.post.call_count == 2
     
-    def test_authenticated_user(self):
-        """Should return display name for authenticated user."""
-        user = AuthenticatedUser(
-            player_id="player_123",
-            steam_id="76561198012345678",
-            steam_display_name="SteamPlayer",
-            email=None,
-        )
-        assert get_creator_name(user) == "SteamPlayer"
+    @pytest.mark.asyncio
+    async def test_concurrent_validations_share_one_request(self):
+        """Concurrent validations of one token make a single PAM request."""
+        async def slow_post(*args, **kwargs):
+            # Keep the request in flight while the other callers arrive
+            await asyncio.sleep(0.01)
+            return pam_response(
+                valid=True, playerId="player_concurrent", steamId="76561198012345678",
+            )
+        
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=slow_post)
+        
+        with patch("app.core.auth._pam_client", mock_instance):
+            users = await asyncio.gather(
+                *(validate_token_with_pam("shared_token") for _ in range(10))
+            )
+        
+        assert mock_instance.post.call_count == 1
+        assert all(user.player_id == "player_concurrent" for user in users)
+        assert not _inflight
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_validation(self):
+        """Cancelling one waiting request leaves the shared validation running for the rest."""
+        release = asyncio.Event()
+        
+        async def blocked_post(*args, **kwargs):
+            await release.wait()
+            return pam_response(
+                valid=True, playerId="player_shielded", steamId="76561198012345678",
+            )
+        
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=blocked_post)
+        
+        with patch("app.core.auth._pam_client", mock_instance):
+            cancelled = asyncio.ensure_future(validate_token_with_pam("shielded_token"))
+            waiting = asyncio.ensure_future(validate_token_with_pam("shielded_token"))
+            await asyncio.sleep(0)
+            
+            cancelled.cancel()
+            release.set()
+            user = await waiting
+        
+        assert cancelled.cancelled()
+        assert user.player_id == "player_shielded"
+        assert mock_instance.post.call_count == 1
+
@@ -1,55 +1,98 @@
 import os
-from typing import List, Dict, Any, Optional
-from pydantic import BaseSettings
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Tuple
+from dotenv import load_dotenv
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings.
+
+    Read from the environment (and .env) once by from_env(); the instance is
+    immutable afterwards, so attribute reads are plain slot loads.
+    """
 
-class Settings(BaseSettings):
-    """Application settings."""
-    
     # Vector database settings
-    MILVUS_HOST: str = os.getenv("MILVUS_HOST", "localhost")
-    MILVUS_PORT: int = int(os.getenv("MILVUS_PORT", "19530"))
-    MILVUS_USER: str = os.getenv("MILVUS_USER", "")
-    MILVUS_PASSWORD: str = os.getenv("MILVUS_PASSWORD", "")
-    MILVUS_COLLECTION: str = os.getenv("MILVUS_COLLECTION", "ashes_knowledge")
-    
+    MILVUS_HOST: str = "localhost"
+    MILVUS_PORT: int = 19530
+    MILVUS_USER: str = ""
+    MILVUS_PASSWORD: str = ""
+    MILVUS_COLLECTION: str = "ashes_knowledge"
+    # Vector index type: FLAT, HNSW, IVF_SQ8 (int8 scalar quantization, 4x smaller)
+    # or IVF_PQ (product quantization, ~64x smaller, lower recall)
+    MILVUS_INDEX_TYPE: str = "IVF_SQ8"
+
     # Redis settings
-    REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
-    REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
-    REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
-    
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_PASSWORD: str = ""
+    REDIS_DB: int = 0
+
     # Embedding model settings
-    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "BAAI/bge-large-en-v1.5")
+    EMBEDDING_MODEL: str = "BAAI/bge-large-en-v1.5"
     EMBEDDING_DIMENSION: int = 1024  # Dimension for BGE Large model
-    
+    # torch.compile the transformer on CUDA (slower first batches, faster steady state)
+    EMBEDDING_COMPILE: bool = False
+    # PyTorch CPU threads for embedding; 0 uses every CPU the process is allowed to run on
+    EMBEDDING_NUM_THREADS: int = 0
+    # Run the transformer on ONNX Runtime when there is no GPU (needs optimum[onnxruntime])
+    EMBEDDING_ONNX_CPU: bool = False
+    # Dynamic int8 quantization on CPU; faster, but similarities drift slightly,
+    # so re-index after toggling it
+    EMBEDDING_INT8: bool = False
+    # bfloat16 weights on CPU; only a win on CPUs with native bf16 (AVX512-BF16 / AMX)
+    EMBEDDING_CPU_BF16: bool = False
+
     # Data source settings
     WIKI_URL: str = "https://ashesofcreation.wiki"
     CODEX_URL: str = "https://ashescodex.com"
     OFFICIAL_URL: str = "https://ashesofcreation.com"
-    
+
     # Data directories
     DATA_DIR: str = "/data"
     RAW_DATA_DIR: str = "/data/raw"
     PROCESSED_DATA_DIR: str = "/data/processed"
     IMAGES_DIR: str = "/data/images"
-    
+
     # Scraping settings
     USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
     REQUEST_TIMEOUT: int = 30  # seconds
     REQUEST_DELAY: float = 1.0  # seconds between requests
     MAX_RETRIES: int = 3
-    
+    # Codex categories scraped at once, each with its own browser context and pages
+    SCRAPE_WORKERS: int = 3
+
     # Game servers
-    GAME_SERVERS: List[str] = os.getenv("GAME_SERVERS", "Alpha-1,Alpha-2").split(",")
-    
+    GAME_SERVERS: Tuple[str, ...] = ("Alpha-1", "Alpha-2")
+
     # Logging
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    
+    LOG_LEVEL: str = "INFO"
+
     # Schedule
-    SCRAPE_INTERVAL: int = int(os.getenv("SCRAPE_INTERVAL", "86400"))  # 24 hours in seconds
-    
-    class Config:
-        env_file = ".env"
+    SCRAPE_INTERVAL: int = 86400  # 24 hours in seconds
+
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """Build settings from environment variables, loading env_file first."""
+        load_dotenv(env_file)
+        overrides = {
+            field.name: ENV_PARSERS[field.type](os.environ[field.name])
+            for field in fields(cls)
+            if field.name in os.environ
+        }
+        return cls(**overrides)
+
+def parse_bool(value: str) -> bool:
+    """Parse a boolean environment variable ("1", "true" and "yes" are true)."""
+    return value.strip().lower() in ("1", "true", "yes")
+
+# Parsers for environment overrides, keyed by the annotated type of each setting
+ENV_PARSERS: Dict[Any, Callable[[str], Any]] = {
+    str: str,
+    int: int,
+    float: float,
+    bool: parse_bool,
+    Tuple[str, ...]: lambda value: tuple(value.split(",")),
+}
 
 # Create global settings instance
-settings = Settings()
+settings = Settings.from_env()
@@ -6,9 +6,13 @@ import torch
 import numpy as np
 import time
 import os
+import re
+import hashlib
 from datetime import datetime
+from functools import lru_cache
 from loguru import logger
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sized
 from sentence_transformers import SentenceTransformer
 
 from config import settings
@@ -16,19 +20,271 @@ from schemas import Document
 
 # Global variables
 _embedding_model = None
+_embedding_device = "cpu"
+_connected = False
+_collection: Optional[Collection] = None
+_collection_loaded = False
+_search_params: Optional[Dict[str, Any]] = None
+
+# Downloaded and exported models are kept on the data volume so container restarts reuse them
+MODELS_DIR = os.path.join(settings.DATA_DIR, "models")
+
+# Single worker: the model (and GPU) is shared, so concurrent encodes would only serialize
+_EMBED_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+
+# Monotonic deadline until which queries skip Milvus because the collection is missing
+_no_collection_until: float = 0.0
+NO_COLLECTION_RETRY_SECONDS = 30
+
+# Number of distinct query embeddings kept in memory
+QUERY_EMBEDDING_CACHE_SIZE = 2048
+
+# Document types are short identifiers ("item", "zone", "news", ...)
+DOC_TYPE_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,100}")
+
+# Scalar fields returned with every similarity search hit
+RESULT_FIELDS = ("id", "text", "metadata", "source", "type", "server")
+
+# Build and search parameters for each supported MILVUS_INDEX_TYPE
+INDEX_PARAMS = {
+    "FLAT": ({}, {}),
+    "HNSW": ({"M": 16, "efConstruction": 200}, {"ef": 100}),
+    "IVF_SQ8": ({"nlist": 1024}, {"nprobe": 16}),
+    # 64 sub-vectors x 8 bits = 64-byte codes, ~64x smaller than FLOAT_VECTOR at dim 1024
+    "IVF_PQ": ({"nlist": 1024, "m": 64, "nbits": 8}, {"nprobe": 16}),
+}
+# Embeddings are L2-normalized at encode time, so inner product equals cosine
+# similarity without the per-candidate norm divisions
+METRIC_TYPE = "IP"
+
+def _index_config() -> tuple:
+    """Look up (build_params, search_params) for the configured index type."""
+    index_type = settings.MILVUS_INDEX_TYPE.upper()
+    if index_type not in INDEX_PARAMS:
+        raise ValueError(
+            f"Unsupported MILVUS_INDEX_TYPE {settings.MILVUS_INDEX_TYPE!r}; "
+            f"expected one of {', '.join(INDEX_PARAMS)}"
+        )
+    build_params, search_params = INDEX_PARAMS[index_type]
+    if "m" in build_params and settings.EMBEDDING_DIMENSION % build_params["m"]:
+        raise ValueError(
+            f"{index_type} needs EMBEDDING_DIMENSION divisible by m={build_params['m']}, "
+            f"got {settings.EMBEDDING_DIMENSION}"
+        )
+    return build_params, search_params
+
+def get_index_params() -> Dict[str, Any]:
+    """Index parameters for the embedding field."""
+    build_params, _ = _index_config()
+    return {
+        "metric_type": METRIC_TYPE,
+        "index_type": settings.MILVUS_INDEX_TYPE.upper(),
+        "params": build_params,
+    }
+
+def get_search_params(collection: Collection) -> Dict[str, Any]:
+    """
+    Search parameters matching the index the collection was actually built with.
+    
+    Collections indexed before MILVUS_INDEX_TYPE/IP (e.g. COSINE + HNSW) keep
+    their index, and Milvus rejects a search whose metric differs from it, so
+    the metric and index type are read from the index rather than the config.
+    """
+    index_params = collection.indexes[0].params
+    index_type = index_params.get("index_type", "").upper()
+    metric_type = index_params.get("metric_type", METRIC_TYPE)
+    if index_type not in INDEX_PARAMS:
+        raise ValueError(f"Unsupported index type {index_type!r} on {settings.MILVUS_COLLECTION}")
+    
+    if (index_type, metric_type) != (settings.MILVUS_INDEX_TYPE.upper(), METRIC_TYPE):
+        logger.warning(
+            f"Collection {settings.MILVUS_COLLECTION} is indexed with {index_type}/{metric_type}, "
+            f"not the configured {settings.MILVUS_INDEX_TYPE.upper()}/{METRIC_TYPE}; "
+            f"searching with the existing index. Drop the collection to rebuild it."
+        )
+    
+    _, search_params = INDEX_PARAMS[index_type]
+    return {
+        "metric_type": metric_type,
+        "params": search_params,
+    }
+
+def _quote_expr_string(value: str, max_length: int) -> str:
+    """Quote a value for a Milvus boolean expression, escaping quotes and backslashes."""
+    if len(value) > max_length:
+        raise ValueError(f"Filter value longer than {max_length} characters")
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+def _build_filter_expr(filters: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Build a Milvus filter expression from validated type/server filters.
+    
+    Values are checked against what can actually be stored (identifier-like
+    types, configured GAME_SERVERS) instead of being interpolated verbatim,
+    so a stray quote can neither break nor rewrite the expression.
+    """
+    if not filters:
+        return None
+    
+    filter_parts = []
+    
+    doc_type = filters.get("type")
+    if doc_type:
+        if not DOC_TYPE_PATTERN.fullmatch(doc_type):
+            raise ValueError(f"Invalid document type filter: {doc_type!r}")
+        filter_parts.append(f"type == '{doc_type}'")
+    
+    server = filters.get("server")
+    if server:
+        if server not in settings.GAME_SERVERS:
+            raise ValueError(f"Unknown server filter: {server!r}")
+        filter_parts.append(f"server == {_quote_expr_string(server, 100)}")
+    
+    return " && ".join(filter_parts) or None
+
+def _ensure_connected():
+    """Open the Milvus connection once per process.
+    
+    connect() is synchronous, so no coroutine can interleave between the
+    check and the assignment and no lock is needed.
+    """
+    global _connected
+    
+    if not _connected:
+        connections.connect(
+            alias="default",
+            host=settings.MILVUS_HOST,
+            port=settings.MILVUS_PORT,
+            user=settings.MILVUS_USER,
+            password=settings.MILVUS_PASSWORD
+        )
+        _connected = True
+
+def _get_collection() -> Collection:
+    """Get the cached Collection handle, creating it on first use."""
+    global _collection
+    
+    if _collection is None:
+        _collection = Collection(settings.MILVUS_COLLECTION)
+    return _collection
+
+def _load_collection() -> Collection:
+    """Get the cached collection, loaded into query nodes once per process.
+    
+    Milvus keeps a loaded collection resident until it is released, so
+    there is no need to call load() again on every query.
+    """
+    global _collection_loaded
+    
+    collection = _get_collection()
+    if not _collection_loaded:
+        collection.load()
+        _collection_loaded = True
+    return collection
+
+def content_hash(text: str) -> str:
+    """Fingerprint of a document's text, used to skip re-embedding unchanged documents."""
+    return hashlib.blake2b(text.encode(), digest_size=32).hexdigest()
+
+def _has_field(collection: Collection, name: str) -> bool:
+    """Whether the collection's schema has a field called name."""
+    return any(field.name == name for field in collection.schema.fields)
+
+def _indexed_hashes(collection: Collection, ids: List[str]) -> Dict[str, str]:
+    """Fetch the stored content_hash for whichever of ids are already indexed."""
+    expr = f"id in [{', '.join(_quote_expr_string(doc_id, 100) for doc_id in ids)}]"
+    rows = collection.query(expr=expr, output_fields=["id", "content_hash"])
+    return {row["id"]: row["content_hash"] for row in rows}
+
+def _load_onnx_transformer(model_name: str):
+    """
+    Load model_name as an ONNX Runtime model for CPU inference.
+    
+    The ONNX export takes minutes for a large model, so the exported graph
+    is saved under MODELS_DIR and reused on later starts.
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    
+    export_dir = os.path.join(MODELS_DIR, model_name.replace("/", "--") + "-onnx")
+    if os.path.isdir(export_dir):
+        return ORTModelForFeatureExtraction.from_pretrained(export_dir, provider="CPUExecutionProvider")
+    
+    logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+    ort_model = ORTModelForFeatureExtraction.from_pretrained(
+        model_name, export=True, provider="CPUExecutionProvider"
+    )
+    ort_model.save_pretrained(export_dir)
+    return ort_model
+
+def _configure_cpu_threads():
+    """
+    Size PyTorch's intra-op pool to the CPUs this process may actually use.
+    
+    torch defaults to the host's core count, which oversubscribes a
+    CPU-limited container. Encoding is one large op at a time, so inter-op
+    parallelism only adds contention.
+    """
+    num_threads = settings.EMBEDDING_NUM_THREADS or len(os.sched_getaffinity(0))
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set before the first inter-op parallel work in the process
+        pass
+    logger.info(f"Using {num_threads} CPU threads for embedding")
 
 def get_embedding_model():
     """Get or load the embedding model."""
-    global _embedding_model
+    global _embedding_model, _embedding_device
     
     if _embedding_model is None:
         # Check if CUDA is available
         device = "cuda" if torch.cuda.is_available() else "cpu"
         logger.info(f"Loading embedding model {settings.EMBEDDING_MODEL} on {device}")
+        if device == "cpu":
+            _configure_cpu_threads()
         
         try:
-            # Load the model
-            _embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL, device=device)
+            # Load the model; it is only downloaded if MODELS_DIR has no copy yet
+            _embedding_model = SentenceTransformer(
+                settings.EMBEDDING_MODEL, device=device, cache_folder=MODELS_DIR
+            )
+            
+            if device == "cuda":
+                # Half-precision weights halve memory traffic and run on tensor cores
+                _embedding_model.half()
+                torch.backends.cuda.matmul.allow_tf32 = True
+                
+                if settings.EMBEDDING_COMPILE:
+                    # encode() already sorts each call's texts by length, so batches
+                    # are near-uniform; dynamic shapes avoid a recompile per length
+                    transformer = _embedding_model._first_module()
+                    transformer.auto_model = torch.compile(transformer.auto_model, dynamic=True)
+                    logger.info("Embedding model compiled with torch.compile")
+            elif settings.EMBEDDING_ONNX_CPU:
+                # Swap only the transformer for the ONNX Runtime graph (fused LayerNorm/GELU
+                # kernels, oneDNN GEMMs); tokenization, pooling and normalization stay in
+                # sentence-transformers so the vectors match the PyTorch model's
+                transformer = _embedding_model._first_module()
+                del transformer.auto_model
+                transformer.auto_model = _load_onnx_transformer(settings.EMBEDDING_MODEL)
+                logger.info("Embedding model running on ONNX Runtime")
+            elif settings.EMBEDDING_INT8:
+                # int8 Linear weights quarter weight traffic and use VNNI dot products;
+                # activations are quantized per batch, so no calibration data is needed
+                transformer = _embedding_model._first_module()
+                transformer.auto_model = torch.ao.quantization.quantize_dynamic(
+                    transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                logger.info("Embedding model Linear layers quantized to int8")
+            elif settings.EMBEDDING_CPU_BF16:
+                # Halves weight traffic; oneDNN runs bf16 GEMMs natively on AMX / AVX512-BF16
+                transformer = _embedding_model._first_module()
+                transformer.auto_model = transformer.auto_model.to(torch.bfloat16)
+                logger.info("Embedding model weights cast to bfloat16")
+            # The ONNX model leaves the module without parameters, so
+            # SentenceTransformer.device cannot be used to find the device
+            _embedding_device = device
             logger.info(f"Embedding model loaded successfully on {device}")
         except Exception as e:
             logger.error(f"Error loading embedding model: {e}")
@@ -36,7 +292,7 @@ def get_embedding_model():
     
     return _embedding_model
 
-def generate_embeddings(texts: List[str], batch_size: int = 32) -> List[List[float]]:
+def generate_embeddings(texts: List[str], batch_size: int = 64) -> np.ndarray:
     """
     Generate embeddings for a list of texts.
     
@@ -45,52 +301,97 @@ def generate_embeddings(texts: List[str], batch_size: int = 32) -> List[List[flo
         batch_size: Batch size for processing
         
     Returns:
-        List of embedding vectors
+        L2-normalized, C-contiguous float32 array of shape (len(texts), dim).
+        pymilvus accepts ndarrays directly, so vectors are never boxed into
+        Python floats.
     """
+    if not texts:
+        return np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+    
     model = get_embedding_model()
     
     try:
-        # Process in batches to avoid OOM issues
-        all_embeddings = []
-        
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            
-            # Generate embeddings
-            with torch.no_grad():
-                embeddings = model.encode(batch, convert_to_tensor=True)
-                
-                # Convert to numpy and then to list
-                embeddings_np = embeddings.cpu().numpy()
-                all_embeddings.append(embeddings_np)
-        
-        # Concatenate all batches
-        if len(all_embeddings) > 1:
-            return np.vstack(all_embeddings).tolist()
-        elif len(all_embeddings) == 1:
-            return all_embeddings[0].tolist()
-        else:
-            return []
+        # encode() batches internally; autocast keeps CUDA matmuls in FP16
+        with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=_embedding_device == "cuda"):
+            embeddings = model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        
+        # Half-precision outputs have no numpy dtype, so upcast before leaving torch;
+        # the collection stores FLOAT_VECTOR
+        return np.ascontiguousarray(embeddings.float().cpu().numpy())
             
     except Exception as e:
         logger.error(f"Error generating embeddings: {e}")
         raise
 
+def embed_single(text: str) -> np.ndarray:
+    """
+    Embed a single query string, bypassing SentenceTransformer.encode().
+    
+    encode() re-validates its kwargs and builds a DataLoader on every call,
+    which dominates the cost for one short query. Tokenizing and running the
+    forward pass directly skips that. Use generate_embeddings for batches.
+    
+    Blocking, and it shares the model with generate_embeddings, so async
+    callers run it on _EMBED_EXECUTOR.
+    
+    Args:
+        text: Text to embed
+        
+    Returns:
+        L2-normalized float32 vector of shape (dim,)
+    """
+    model = get_embedding_model()
+    
+    features = model.tokenize([text])
+    features = {k: v.to(_embedding_device, non_blocking=True) for k, v in features.items()}
+    
+    with torch.inference_mode():
+        embedding = model.forward(features)["sentence_embedding"]
+        embedding = torch.nn.functional.normalize(embedding, p=2, dim=1)
+    
+    return embedding.squeeze(0).float().cpu().numpy()
+
+@lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+def _embed_query_cached(text: str) -> np.ndarray:
+    """Memoized embed_single; the returned array is shared, so it is read-only."""
+    embedding = embed_single(text)
+    embedding.setflags(write=False)
+    return embedding
+
+def embed_query(query_text: str) -> np.ndarray:
+    """
+    Embed a search query, reusing the vector for repeated queries.
+    
+    Only surrounding/repeated whitespace is normalized; case is kept since
+    it can change the embedding. No TTL is needed because a query's vector
+    only changes when the model does, and that requires a restart.
+    """
+    return _embed_query_cached(" ".join(query_text.split()))
+
 async def setup_vector_collection():
     """Set up the Milvus collection if it doesn't exist."""
+    global _no_collection_until, _collection, _search_params
+    
     try:
         # Connect to Milvus
-        connections.connect(
-            alias="default",
-            host=settings.MILVUS_HOST,
-            port=settings.MILVUS_PORT,
-            user=settings.MILVUS_USER,
-            password=settings.MILVUS_PASSWORD
-        )
+        _ensure_connected()
         
         # Check if collection exists
         if utility.has_collection(settings.MILVUS_COLLECTION):
             logger.info(f"Collection {settings.MILVUS_COLLECTION} already exists")
+            if not _has_field(_get_collection(), "content_hash"):
+                # Created before content hashes were stored; index_documents
+                # then re-embeds every document instead of skipping unchanged ones
+                logger.warning(
+                    f"Collection {settings.MILVUS_COLLECTION} has no content_hash field; "
+                    f"drop it to enable skipping unchanged documents"
+                )
             return
         
         # Define fields for the collection
@@ -101,6 +402,7 @@ async def setup_vector_collection():
             FieldSchema(name="source", dtype=DataType.VARCHAR, max_length=1000),
             FieldSchema(name="type", dtype=DataType.VARCHAR, max_length=100),
             FieldSchema(name="server", dtype=DataType.VARCHAR, max_length=100),
+            FieldSchema(name="content_hash", dtype=DataType.VARCHAR, max_length=64),
             FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=settings.EMBEDDING_DIMENSION)
         ]
         
@@ -108,96 +410,162 @@ async def setup_vector_collection():
         schema = CollectionSchema(fields, "Ashes of Creation knowledge base")
         collection = Collection(settings.MILVUS_COLLECTION, schema)
         
-        # Create index for vector search
-        index_params = {
-            "metric_type": "COSINE",
-            "index_type": "HNSW",
-            "params": {"M": 8, "efConstruction": 64}
-        }
-        collection.create_index("embedding", index_params)
+        # No index yet: index_documents builds it once over the first full load
+        # instead of per segment while rows are still arriving
+        logger.info(f"Created collection {settings.MILVUS_COLLECTION}")
         
-        logger.info(f"Created collection {settings.MILVUS_COLLECTION} with index")
+        # Let queries through again now that the collection exists
+        _collection = collection
+        _search_params = None
+        _no_collection_until = 0.0
         
     except Exception as e:
         logger.error(f"Error setting up vector collection: {e}")
         raise
 
-async def index_documents(documents: List[Document]):
+async def _iter_batches(
+    documents: Union[Iterable[Document], AsyncIterable[Document]], batch_size: int
+) -> AsyncIterator[List[Document]]:
+    """Group a sync or async stream of documents into lists of batch_size."""
+    batch: List[Document] = []
+    
+    if isinstance(documents, AsyncIterable):
+        async for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    else:
+        for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    
+    if batch:
+        yield batch
+
+async def index_documents(documents: Union[Iterable[Document], AsyncIterable[Document]]):
     """
     Index documents in the Milvus vector store.
     
+    Documents are consumed as a stream, so callers can pass an async
+    generator and only one batch is held in memory at a time.
+    
     Args:
-        documents: List of documents to index
+        documents: Documents to index (list, iterable or async iterable)
     """
-    if not documents:
-        logger.warning("No documents provided for indexing")
-        return
-    
     try:
         # Connect to Milvus
-        connections.connect(
-            alias="default",
-            host=settings.MILVUS_HOST,
-            port=settings.MILVUS_PORT,
-            user=settings.MILVUS_USER,
-            password=settings.MILVUS_PASSWORD
-        )
+        _ensure_connected()
         
         # Get the collection
-        collection = Collection(settings.MILVUS_COLLECTION)
-        
-        # Prepare the data for insertion
-        total_docs = len(documents)
-        batch_size = 50  # Process in batches of 50 documents
-        
-        logger.info(f"Indexing {total_docs} documents in batches of {batch_size}")
+        collection = _get_collection()
+        
+        # Rows per Milvus write; generate_embeddings splits each of these into
+        # smaller GPU batches itself, so the two sizes are tuned independently
+        batch_size = 1000
+        total_docs = 0
+        skipped_docs = 0
+        
+        logger.info(f"Indexing documents in batches of {batch_size}")
+        
+        # Write of batch i runs in a worker thread while batch i+1 is embedded;
+        # at most one write is in flight, which also bounds memory
+        loop = asyncio.get_running_loop()
+        pending_insert = None
+        
+        # Collections created before content hashes were stored have no
+        # content_hash field, so they can neither be queried for it nor take it
+        store_hashes = _has_field(collection, "content_hash")
+        
+        # Unchanged documents can only be detected once the collection has
+        # data and an index (query needs it loaded)
+        skip_unchanged = store_hashes and collection.has_index() and collection.num_entities > 0
+        if skip_unchanged:
+            await loop.run_in_executor(None, _load_collection)
+        
+        progress = tqdm(
+            total=len(documents) if isinstance(documents, Sized) else None,
+            desc="Indexing documents",
+        )
         
-        for i in tqdm(range(0, total_docs, batch_size), desc="Indexing documents"):
-            batch = documents[i:i + batch_size]
-            
-            # Extract document texts
-            texts = [doc.text for doc in batch]
-            
-            # Generate embeddings (CPU-intensive operation)
-            with ThreadPoolExecutor() as executor:
-                loop = asyncio.get_event_loop()
-                embeddings = await loop.run_in_executor(executor, generate_embeddings, texts)
-            
-            # Prepare batch data for insertion
-            ids = [doc.id for doc in batch]
-            metadata_json = [doc.metadata.json() for doc in batch]
-            sources = [doc.metadata.source for doc in batch]
-            types = [doc.metadata.type for doc in batch]
-            servers = [doc.metadata.server if doc.metadata.server else "" for doc in batch]
-            
-            # Insert data into Milvus
-            collection.insert([
-                ids,           # id field
-                texts,         # text field
-                metadata_json, # metadata field
-                sources,       # source field
-                types,         # type field
-                servers,       # server field
-                embeddings     # embedding field
-            ])
-            
-            # Small delay to avoid overwhelming the server
-            await asyncio.sleep(0.1)
+        try:
+            async for batch in _iter_batches(documents, batch_size):
+                total_docs += len(batch)
+                progress.update(len(batch))
+                
+                hashes = [content_hash(doc.text) for doc in batch]
+                
+                # Chunk IDs are positional, so an indexed ID can hold older text;
+                # drop only documents whose stored hash matches their text
+                if skip_unchanged:
+                    indexed = await loop.run_in_executor(
+                        None, _indexed_hashes, collection, [doc.id for doc in batch]
+                    )
+                    changed = [
+                        (doc, doc_hash) for doc, doc_hash in zip(batch, hashes)
+                        if indexed.get(doc.id) != doc_hash
+                    ]
+                    skipped_docs += len(batch) - len(changed)
+                    if not changed:
+                        continue
+                    batch = [doc for doc, _ in changed]
+                    hashes = [doc_hash for _, doc_hash in changed]
+                
+                # Split the batch into per-field columns in a single pass
+                ids, texts, metadata, sources, types, servers = [], [], [], [], [], []
+                for doc in batch:
+                    doc_metadata = doc.metadata
+                    ids.append(doc.id)
+                    texts.append(doc.text)
+                    # JSON field takes dicts directly; no per-row json string round-trip
+                    metadata.append(doc_metadata.model_dump())
+                    sources.append(doc_metadata.source)
+                    types.append(doc_metadata.type)
+                    servers.append(doc_metadata.server or "")
+                
+                # Generate embeddings off the event loop (CPU/GPU-intensive operation)
+                embeddings = await loop.run_in_executor(
+                    _EMBED_EXECUTOR, generate_embeddings, texts
+                )
+                
+                # Wait for the previous write before starting the next one
+                if pending_insert is not None:
+                    await pending_insert
+                
+                # Upsert into Milvus so re-indexing a document replaces it by id
+                columns = [
+                    ids,           # id field
+                    texts,         # text field
+                    metadata,      # metadata field
+                    sources,       # source field
+                    types,         # type field
+                    servers,       # server field
+                ]
+                if store_hashes:
+                    columns.append(hashes)  # content_hash field
+                columns.append(embeddings)  # embedding field
+                pending_insert = loop.run_in_executor(None, collection.upsert, columns)
+        finally:
+            progress.close()
+            if pending_insert is not None:
+                await pending_insert
+        
+        if not total_docs:
+            logger.warning("No documents provided for indexing")
+            return
         
         # Flush to make sure data is committed
         collection.flush()
         
-        # Create an index if it doesn't exist
+        # Build the index once all rows are in (first run on a new collection)
         if not collection.has_index():
             logger.info("Creating index for vector search")
-            index_params = {
-                "metric_type": "COSINE",
-                "index_type": "HNSW",
-                "params": {"M": 8, "efConstruction": 64}
-            }
-            collection.create_index("embedding", index_params)
+            await loop.run_in_executor(None, collection.create_index, "embedding", get_index_params())
+            await loop.run_in_executor(None, _load_collection)
         
-        logger.info(f"Successfully indexed {total_docs} documents")
+        logger.info(f"Successfully indexed {total_docs} documents ({skipped_docs} unchanged, skipped)")
         
     except Exception as e:
         logger.error(f"Error indexing documents: {e}")
@@ -212,19 +580,13 @@ async def delete_documents_by_source(source: str):
     """
     try:
         # Connect to Milvus
-        connections.connect(
-            alias="default",
-            host=settings.MILVUS_HOST,
-            port=settings.MILVUS_PORT,
-            user=settings.MILVUS_USER,
-            password=settings.MILVUS_PASSWORD
-        )
+        _ensure_connected()
         
         # Get the collection
-        collection = Collection(settings.MILVUS_COLLECTION)
+        collection = _get_collection()
         
         # Delete by expression
-        expr = f"source like '{source}%'"
+        expr = f"source like {_quote_expr_string(source + '%', 1000)}"
         collection.delete(expr)
         
         # Flush to make sure data is committed
@@ -248,44 +610,48 @@ async def query_similar_documents(query_text: str, limit: int = 5, filters: Opti
     Returns:
         List of documents with similarity scores
     """
+    global _no_collection_until, _collection, _collection_loaded, _search_params
+    
+    # Collection was missing recently - don't hit Milvus again until the TTL expires
+    if time.monotonic() < _no_collection_until:
+        return []
+    
     try:
         # Connect to Milvus
-        connections.connect(
-            alias="default",
-            host=settings.MILVUS_HOST,
-            port=settings.MILVUS_PORT,
-            user=settings.MILVUS_USER,
-            password=settings.MILVUS_PASSWORD
-        )
+        _ensure_connected()
+        
+        # Bail out early if the pipeline hasn't created the collection yet
+        if not utility.has_collection(settings.MILVUS_COLLECTION):
+            logger.warning(f"Collection {settings.MILVUS_COLLECTION} does not exist yet")
+            _no_collection_until = time.monotonic() + NO_COLLECTION_RETRY_SECONDS
+            _collection = None
+            _collection_loaded = False
+            _search_params = None
+            return []
         
-        # Get the collection
-        collection = Collection(settings.MILVUS_COLLECTION)
+        # The collection can only be loaded once the first indexing run has built its index
+        if not _collection_loaded and not _get_collection().has_index():
+            logger.warning(f"Collection {settings.MILVUS_COLLECTION} is not indexed yet")
+            _no_collection_until = time.monotonic() + NO_COLLECTION_RETRY_SECONDS
+            return []
+        _no_collection_until = 0.0
         
-        # Load the collection if not already loaded
-        collection.load()
+        # Get the collection, loading it on first use only
+        collection = _load_collection()
         
-        # Generate query embedding
-        query_embedding = generate_embeddings([query_text])[0]
+        # Generate query embedding (1-D float32 ndarray) on the embedding thread, so the
+        # forward pass neither blocks the event loop nor races an indexing batch
+        query_embedding = await asyncio.get_running_loop().run_in_executor(
+            _EMBED_EXECUTOR, embed_query, query_text
+        )
         
-        # Prepare search parameters
-        search_params = {
-            "metric_type": "COSINE",
-            "params": {"ef": 100}
-        }
+        # Search parameters depend only on the index, so describe it once
+        if _search_params is None:
+            _search_params = get_search_params(collection)
+        search_params = _search_params
         
         # Prepare filter expression if filters are provided
-        expr = None
-        if filters:
-            filter_parts = []
-            
-            if "type" in filters and filters["type"]:
-                filter_parts.append(f"type == '{filters['type']}'")
-                
-            if "server" in filters and filters["server"]:
-                filter_parts.append(f"server == '{filters['server']}'")
-                
-            if filter_parts:
-                expr = " && ".join(filter_parts)
+        expr = _build_filter_expr(filters)
         
         # Execute search
         results = collection.search(
@@ -294,23 +660,16 @@ async def query_similar_documents(query_text: str, limit: int = 5, filters: Opti
             param=search_params,
             limit=limit,
             expr=expr,
-            output_fields=["id", "text", "metadata", "source", "type", "server"]
+            output_fields=list(RESULT_FIELDS)
         )
         
         # Process results
-        documents = []
-        if results and len(results) > 0:
-            for hits in results:
-                for hit in hits:
-                    documents.append({
-                        "id": hit.entity.get("id"),
-                        "text": hit.entity.get("text"),
-                        "metadata": hit.entity.get("metadata"),
-                        "source": hit.entity.get("source"),
-                        "type": hit.entity.get("type"),
-                        "server": hit.entity.get("server"),
-                        "score": hit.score
-                    })
+        documents = [
+            {**{field: entity.get(field) for field in RESULT_FIELDS}, "score": hit.score}
+            for hits in results or []
+            for hit in hits
+            for entity in (hit.entity,)
+        ]
         
         return documents
         
@@ -1,7 +1,6 @@
 import os
 import time
 import asyncio
-import schedule
 from loguru import logger
 import sys
 from datetime import datetime
@@ -35,6 +34,7 @@ async def run_data_pipeline(force_full_scrape=False):
         Path("/data/raw").mkdir(parents=True, exist_ok=True)
         Path("/data/processed").mkdir(parents=True, exist_ok=True)
         Path("/data/images").mkdir(parents=True, exist_ok=True)
+        Path("/data/models").mkdir(parents=True, exist_ok=True)
         
         # Step 1: Setup Milvus Collection
         logger.info("Setting up Milvus collection...")
@@ -60,10 +60,11 @@ async def run_data_pipeline(force_full_scrape=False):
         
         # Step 3: Process and chunk the documents
         logger.info("Processing and chunking documents...")
-        documents = await chunk_documents("/data/raw", "/data/processed")
+        # Chunks are streamed straight into the indexer as they are produced
+        documents = chunk_documents("/data/raw", "/data/processed")
         
         # Step 4: Index documents in vector store
-        logger.info(f"Indexing {len(documents)} documents in vector store...")
+        logger.info("Indexing documents in vector store...")
         await index_documents(documents)
         
         # Log completion
@@ -74,8 +75,13 @@ async def run_data_pipeline(force_full_scrape=False):
         logger.error(f"Error in data pipeline: {e}")
         raise
 
-def schedule_pipeline():
-    """Schedule the data pipeline to run at regular intervals."""
+async def schedule_pipeline():
+    """
+    Run the data pipeline now and then at regular intervals.
+    
+    All runs share one event loop, so the embedding model, Milvus
+    connection and worker threads stay warm between runs.
+    """
     # Get interval from environment (default to 24 hours)
     interval_seconds = int(os.getenv("SCRAPE_INTERVAL", "86400"))
     
@@ -84,16 +90,13 @@ def schedule_pipeline():
     
     logger.info(f"Scheduling data pipeline to run every {interval_hours:.1f} hours")
     
-    # Schedule the pipeline
-    schedule.every(interval_seconds).seconds.do(lambda: asyncio.run(run_data_pipeline()))
-    
     # Run immediately on startup
-    asyncio.run(run_data_pipeline(force_full_scrape=True))
+    await run_data_pipeline(force_full_scrape=True)
     
-    # Keep the scheduler running
+    # Then once per interval, counted from the end of the previous run
     while True:
-        schedule.run_pending()
-        time.sleep(1)
+        await asyncio.sleep(interval_seconds)
+        await run_data_pipeline()
 
 if __name__ == "__main__":
     logger.info("Starting Ashes of Creation data pipeline service")
@@ -104,4 +107,4 @@ if __name__ == "__main__":
         asyncio.run(run_data_pipeline(force_full_scrape=True))
     else:
         # Otherwise, run on a schedule
-        schedule_pipeline()
+        asyncio.run(schedule_pipeline())
@@ -1,12 +1,13 @@
 import os
-import json
-import uuid
-from typing import List, Dict, Any, Optional
+import hashlib
+import ijson
+import orjson
+from typing import List, Dict, Any, Optional, AsyncIterator, BinaryIO, Deque, Iterator, Tuple
 from loguru import logger
 import re
 from pathlib import Path
 import asyncio
-from glob import glob
+from collections import deque
 import time
 from datetime import datetime
 
@@ -18,41 +19,120 @@ MAX_CHUNK_SIZE = 1024  # Maximum chunk size in characters
 MIN_CHUNK_SIZE = 50    # Minimum chunk size in characters
 OVERLAP_SIZE = 100     # Overlap between chunks in characters
 
-async def load_raw_documents(raw_data_dir: str) -> List[Dict[str, Any]]:
+# Raw files larger than this are parsed incrementally instead of in one read
+STREAM_FILE_SIZE = 16 * 1024 * 1024
+# Raw files read ahead of the chunker at once, which also caps open file handles
+MAX_FILES_IN_FLIGHT = 16
+# Write buffer per processed chunk file; each chunk line is only a few KB
+CHUNK_FILE_BUFFER_SIZE = 1 << 20
+
+# Chunk boundaries: blank lines between paragraphs, whitespace after sentence ends
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+def _iter_json_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively yield JSON files under directory as they are found, skipping hidden entries."""
+    try:
+        entries = os.scandir(directory)
+    except OSError as e:
+        logger.error(f"Error listing {directory}: {e}")
+        return
+    
+    with entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                yield from _iter_json_files(entry.path)
+            elif entry.name.endswith('.json'):
+                yield entry
+
+def _read_json_file(file_path: str) -> List[Dict[str, Any]]:
+    """Read a whole JSON file holding one document or an array of documents."""
+    try:
+        with open(file_path, 'rb') as f:
+            file_data = orjson.loads(f.read())
+    except Exception as e:
+        logger.error(f"Error loading document {file_path}: {e}")
+        return []
+    
+    return file_data if isinstance(file_data, list) else [file_data]
+
+def _stream_json_array(file_path: str) -> Iterator[Dict[str, Any]]:
+    """Parse a large JSON file incrementally, one array item at a time."""
+    try:
+        with open(file_path, 'rb') as f:
+            # Handle both single documents and arrays of documents
+            first_char = f.read(1)
+            while first_char.isspace():
+                first_char = f.read(1)
+            f.seek(0)
+            
+            if first_char == b'[':
+                # use_float keeps numbers as float instead of Decimal
+                yield from ijson.items(f, 'item', use_float=True)
+            else:
+                yield orjson.loads(f.read())
+                
+    except Exception as e:
+        logger.error(f"Error loading document {file_path}: {e}")
+
+async def load_raw_documents(raw_data_dir: str) -> AsyncIterator[Dict[str, Any]]:
     """
-    Load raw documents from the data directory.
+    Stream raw documents from the data directory.
+    
+    Files up to STREAM_FILE_SIZE are read and parsed in worker threads,
+    up to MAX_FILES_IN_FLIGHT ahead of the consumer, so disk reads overlap
+    with chunking and the event loop is never blocked on I/O. Larger files
+    holding a JSON array are parsed incrementally instead, so only one
+    document of a large scrape is in memory at a time.
     
     Args:
         raw_data_dir: Directory containing raw JSON documents
         
-    Returns:
-        List of document dictionaries
+    Yields:
+        Document dictionaries
     """
-    documents = []
+    document_count = 0
+    pending: Deque[asyncio.Task] = deque()
     
-    # Get all JSON files
-    json_files = glob(f"{raw_data_dir}/**/*.json", recursive=True)
-    
-    for file_path in json_files:
-        try:
+    try:
+        for entry in _iter_json_files(raw_data_dir):
             # Skip files that start with underscore (config files)
-            if os.path.basename(file_path).startswith('_'):
+            if entry.name.startswith('_'):
                 continue
-                
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_data = json.load(f)
-                
-                # Handle both single documents and arrays of documents
-                if isinstance(file_data, list):
-                    documents.extend(file_data)
-                else:
-                    documents.append(file_data)
-                    
-        except Exception as e:
-            logger.error(f"Error loading document {file_path}: {e}")
+            
+            if entry.stat().st_size <= STREAM_FILE_SIZE:
+                pending.append(asyncio.create_task(asyncio.to_thread(_read_json_file, entry.path)))
+                if len(pending) < MAX_FILES_IN_FLIGHT:
+                    continue
+                documents = await pending.popleft()
+                document_count += len(documents)
+                for document in documents:
+                    yield document
+                continue
+            
+            # Drain the files read so far before streaming a large one
+            while pending:
+                documents = await pending.popleft()
+                document_count += len(documents)
+                for document in documents:
+                    yield document
+            for document in _stream_json_array(entry.path):
+                document_count += 1
+                yield document
+        
+        while pending:
+            documents = await pending.popleft()
+            document_count += len(documents)
+            for document in documents:
+                yield document
+    finally:
+        # The consumer stopped early; don't leave reads running
+        for task in pending:
+            task.cancel()
     
-    logger.info(f"Loaded {len(documents)} raw documents")
-    return documents
+    logger.info(f"Loaded {document_count} raw documents")
 
 def get_document_source(document: Dict[str, Any]) -> str:
     """Extract the source from a document."""
@@ -119,10 +199,54 @@ def extract_text_content(document: Dict[str, Any]) -> str:
         
         return "\n\n".join(text_parts) if text_parts else "No text content available."
 
+def _split_spans(pattern: re.Pattern, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) spans of the pieces of text[start:end] separated by pattern."""
+    for match in pattern.finditer(text, start, end):
+        yield start, match.start()
+        start = match.end()
+    yield start, end
+
+def _piece_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """Yield paragraph spans, splitting paragraphs over MAX_CHUNK_SIZE into sentence spans."""
+    for para_start, para_end in _split_spans(PARAGRAPH_BREAK, text, 0, len(text)):
+        if para_end - para_start > MAX_CHUNK_SIZE:
+            yield from _split_spans(SENTENCE_BREAK, text, para_start, para_end)
+        else:
+            yield para_start, para_end
+
+def chunk_id(source: str, doc_type: str, server: Optional[str], chunk_index: int) -> str:
+    """
+    Deterministic ID for a chunk, derived from where it came from.
+    
+    Re-chunking a document yields the same IDs, so re-runs upsert over the
+    existing vectors instead of inserting duplicates. The text is left out
+    so an edited chunk replaces its old vector; the indexer's content hash
+    decides whether it needs re-embedding. Raw document IDs are deliberately
+    left out since some scrapers assign fresh random ones on every run.
+    """
+    key = f"{source}\x00{doc_type}\x00{server or ''}\x00{chunk_index}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+def _make_chunk(text: str, metadata: Dict[str, Any], chunk_index: int, source: str, doc_type: str, server: Optional[str]) -> Dict[str, Any]:
+    """Build the chunk dictionary for one piece of a document."""
+    return {
+        "id": chunk_id(source, doc_type, server, chunk_index),
+        "text": text,
+        "metadata": {**metadata, "chunk_index": chunk_index},
+        "source": source,
+        "type": doc_type,
+        "server": server
+    }
+
 def chunk_text(text: str, metadata: Dict[str, Any], source: str, doc_type: str, server: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Split text into chunks with overlap.
     
+    Paragraphs (and sentences of oversized paragraphs) are tracked as
+    offsets into text and each chunk is a single slice, so the text is
+    scanned once and pieces are never copied and re-joined. Each chunk
+    starts with the last piece of the previous one for overlap.
+    
     Args:
         text: Text to chunk
         metadata: Metadata for the document
@@ -133,177 +257,145 @@ def chunk_text(text: str, metadata: Dict[str, Any], source: str, doc_type: str,
     Returns:
         List of chunk dictionaries
     """
-    chunks = []
-    
     # If text is too short for chunking, return as a single chunk
     if len(text) <= MAX_CHUNK_SIZE:
-        return [{
-            "id": str(uuid.uuid4()),
-            "text": text,
-            "metadata": {**metadata, "chunk_index": 0},
-            "source": source,
-            "type": doc_type,
-            "server": server
-        }]
+        return [_make_chunk(text, metadata, 0, source, doc_type, server)]
     
-    # Split by paragraphs first to preserve context
-    paragraphs = re.split(r'\n\s*\n', text)
-    
-    current_chunk = []
-    current_size = 0
+    chunks = []
+    chunk_start = None  # offset of the current chunk's first piece
+    chunk_end = 0       # offset just past the current chunk's last piece
+    last_piece_start = 0
+    current_size = 0    # characters in the current chunk's pieces, excluding separators
     chunk_index = 0
     
-    for para in paragraphs:
-        para_size = len(para)
+    for piece_start, piece_end in _piece_spans(text):
+        piece_size = piece_end - piece_start
         
-        # If a single paragraph is too large, split it by sentences
-        if para_size > MAX_CHUNK_SIZE:
-            sentences = re.split(r'(?<=[.!?])\s+', para)
-            for sentence in sentences:
-                sentence_size = len(sentence)
-                
-                # If this sentence would exceed max size, create a chunk and start a new one
-                if current_size + sentence_size > MAX_CHUNK_SIZE and current_size > MIN_CHUNK_SIZE:
-                    chunk_text = "\n\n".join(current_chunk)
-                    chunks.append({
-                        "id": str(uuid.uuid4()),
-                        "text": chunk_text,
-                        "metadata": {**metadata, "chunk_index": chunk_index},
-                        "source": source,
-                        "type": doc_type,
-                        "server": server
-                    })
-                    
-                    # Start a new chunk with overlap
-                    overlap_text = current_chunk[-1] if current_chunk else ""
-                    current_chunk = [overlap_text] if overlap_text else []
-                    current_size = len(overlap_text) if overlap_text else 0
-                    chunk_index += 1
-                
-                current_chunk.append(sentence)
-                current_size += sentence_size
-        else:
-            # If adding this paragraph would exceed max size, create a chunk and start a new one
-            if current_size + para_size > MAX_CHUNK_SIZE and current_size > MIN_CHUNK_SIZE:
-                chunk_text = "\n\n".join(current_chunk)
-                chunks.append({
-                    "id": str(uuid.uuid4()),
-                    "text": chunk_text,
-                    "metadata": {**metadata, "chunk_index": chunk_index},
-                    "source": source,
-                    "type": doc_type,
-                    "server": server
-                })
-                
-                # Start a new chunk with overlap
-                overlap_text = current_chunk[-1] if current_chunk else ""
-                current_chunk = [overlap_text] if overlap_text else []
-                current_size = len(overlap_text) if overlap_text else 0
-                chunk_index += 1
+        # If this piece would exceed max size, create a chunk and start a new one
+        if current_size + piece_size > MAX_CHUNK_SIZE and current_size > MIN_CHUNK_SIZE:
+            chunks.append(_make_chunk(text[chunk_start:chunk_end], metadata, chunk_index, source, doc_type, server))
             
-            current_chunk.append(para)
-            current_size += para_size
+            # Start a new chunk with the previous piece as overlap
+            chunk_start = last_piece_start
+            current_size = chunk_end - last_piece_start
+            chunk_index += 1
+        
+        if chunk_start is None:
+            chunk_start = piece_start
+        chunk_end = piece_end
+        last_piece_start = piece_start
+        current_size += piece_size
     
-    # Add the final chunk if there's content left
-    if current_chunk:
-        chunk_text = "\n\n".join(current_chunk)
-        chunks.append({
-            "id": str(uuid.uuid4()),
-            "text": chunk_text,
-            "metadata": {**metadata, "chunk_index": chunk_index},
-            "source": source,
-            "type": doc_type,
-            "server": server
-        })
+    # Add the final chunk
+    chunks.append(_make_chunk(text[chunk_start:chunk_end], metadata, chunk_index, source, doc_type, server))
     
     return chunks
 
-async def chunk_documents(raw_data_dir: str, processed_data_dir: str) -> List[Document]:
+async def chunk_documents(raw_data_dir: str, processed_data_dir: str) -> AsyncIterator[Document]:
     """
     Process and chunk raw documents into smaller pieces for efficient indexing.
     
+    Documents are chunked one at a time as the caller consumes them. Each
+    chunk is appended to {type}_chunks.jsonl and all_chunks.jsonl in
+    processed_data_dir as it is produced, so neither the raw corpus nor
+    the chunks are ever held in memory together.
+    
+    Chunks whose text (for the same server) was already produced in this
+    run, e.g. pages mirrored between the wiki and the codex, are dropped
+    so they are neither stored twice nor embedded twice.
+    
     Args:
         raw_data_dir: Directory containing raw documents
         processed_data_dir: Directory to store processed chunks
         
-    Returns:
-        List of processed Document objects ready for indexing
+    Yields:
+        Processed Document objects ready for indexing
     """
-    # Load raw documents
-    raw_documents = await load_raw_documents(raw_data_dir)
-    
     # Create processed directory if it doesn't exist
     os.makedirs(processed_data_dir, exist_ok=True)
     
-    # Track all chunks and process each document
-    all_chunks = []
-    
-    logger.info(f"Processing {len(raw_documents)} documents for chunking")
+    # One JSON Lines file per chunk type, opened when its first chunk arrives
+    type_files: Dict[str, BinaryIO] = {}
+    all_chunks_file = open(os.path.join(processed_data_dir, "all_chunks.jsonl"), 'wb', buffering=CHUNK_FILE_BUFFER_SIZE)
+    document_count = 0
+    chunk_count = 0
+    duplicate_count = 0
+    # 16-byte digests of (server, text) for every chunk emitted so far
+    seen_chunks = set()
     
-    for doc in raw_documents:
-        # Extract document properties
-        source = get_document_source(doc)
-        doc_type = get_document_type(doc)
-        server = get_document_server(doc)
-        
-        # Get text content from the document
-        text = extract_text_content(doc)
-        
-        # Skip if no text content
-        if not text:
-            continue
+    try:
+        async for doc in load_raw_documents(raw_data_dir):
+            document_count += 1
             
-        # Get appropriate metadata
-        metadata = doc.get('metadata', {})
-        if not isinstance(metadata, dict):
-            metadata = {}
+            # Extract document properties
+            source = get_document_source(doc)
+            doc_type = get_document_type(doc)
+            server = get_document_server(doc)
             
-        # Add document ID to metadata if available
-        if 'id' in doc:
-            metadata['document_id'] = doc['id']
+            # Get text content from the document
+            text = extract_text_content(doc)
             
-        # Add original properties to metadata
-        for key, value in doc.items():
-            if key not in ['text', 'content', 'metadata'] and isinstance(value, (str, int, float, bool)):
-                metadata[key] = value
-        
-        # Chunk the document
-        doc_chunks = chunk_text(text, metadata, source, doc_type, server)
-        
-        # Convert chunks to Document objects
-        for chunk in doc_chunks:
-            document = Document(
-                id=chunk["id"],
-                text=chunk["text"],
-                metadata=DocumentMetadata(
+            # Skip if no text content
+            if not text:
+                continue
+                
+            # Get appropriate metadata
+            metadata = doc.get('metadata', {})
+            if not isinstance(metadata, dict):
+                metadata = {}
+                
+            # Add document ID to metadata if available
+            if 'id' in doc:
+                metadata['document_id'] = doc['id']
+                
+            # Add original properties to metadata
+            for key, value in doc.items():
+                if key not in ['text', 'content', 'metadata'] and isinstance(value, (str, int, float, bool)):
+                    metadata[key] = value
+            
+            # Chunk the document
+            doc_chunks = chunk_text(text, metadata, source, doc_type, server)
+            
+            # Convert chunks to Document objects
+            for chunk in doc_chunks:
+                chunk_key = hashlib.blake2b(
+                    f"{chunk['server'] or ''}\x00{chunk['text']}".encode(), digest_size=16
+                ).digest()
+                if chunk_key in seen_chunks:
+                    duplicate_count += 1
+                    continue
+                seen_chunks.add(chunk_key)
+                
+                document = Document(
                     id=chunk["id"],
-                    type=chunk["type"],
-                    source=chunk["source"],
-                    server=chunk["server"],
-                    timestamp=datetime.now().isoformat()
+                    text=chunk["text"],
+                    metadata=DocumentMetadata(
+                        id=chunk["id"],
+                        type=chunk["type"],
+                        source=chunk["source"],
+                        server=chunk["server"],
+                        timestamp=datetime.now().isoformat()
+                    )
                 )
-            )
-            all_chunks.append(document)
-    
-    # Group chunks by type for organization
-    chunks_by_type = {}
-    for chunk in all_chunks:
-        chunk_type = chunk.metadata.type
-        if chunk_type not in chunks_by_type:
-            chunks_by_type[chunk_type] = []
-        chunks_by_type[chunk_type].append(chunk)
-    
-    # Save each type to a separate file
-    for chunk_type, chunks in chunks_by_type.items():
-        output_path = os.path.join(processed_data_dir, f"{chunk_type}_chunks.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump([chunk.dict() for chunk in chunks], f, ensure_ascii=False, indent=2)
-    
-    logger.info(f"Processed {len(raw_documents)} documents into {len(all_chunks)} chunks")
-    
-    # Save a combined file with all chunks
-    all_chunks_path = os.path.join(processed_data_dir, "all_chunks.json")
-    with open(all_chunks_path, 'w', encoding='utf-8') as f:
-        json.dump([chunk.dict() for chunk in all_chunks], f, ensure_ascii=False, indent=2)
+                
+                # Append to the per-type and combined files
+                chunk_type = document.metadata.type
+                if chunk_type not in type_files:
+                    output_path = os.path.join(processed_data_dir, f"{chunk_type}_chunks.jsonl")
+                    type_files[chunk_type] = open(output_path, 'wb', buffering=CHUNK_FILE_BUFFER_SIZE)
+                # orjson writes UTF-8 bytes directly, without escaping non-ASCII
+                line = orjson.dumps(document.model_dump()) + b"\n"
+                type_files[chunk_type].write(line)
+                all_chunks_file.write(line)
+                chunk_count += 1
+                
+                yield document
+    finally:
+        all_chunks_file.close()
+        for f in type_files.values():
+            f.close()
     
-    return all_chunks
+    logger.info(
+        f"Processed {document_count} documents into {chunk_count} chunks "
+        f"({duplicate_count} duplicate chunks dropped)"
+    )
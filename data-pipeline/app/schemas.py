@@ -183,6 +183,16 @@ class Profession(BaseModel):
     recipes: Optional[List[str]] = None
 
 
+class NewsArticle(BaseModel):
+    """Represents a news article from the official website."""
+    id: str = Field(..., description="Article ID")
+    title: str = Field(..., description="Article title")
+    date: str = Field(..., description="Publication date as shown on the site")
+    url: str = Field(..., description="Article URL, empty if the listing has no link")
+    summary: str = Field(..., description="Article summary from the news listing")
+    content: Optional[str] = None
+
+
 class DocumentMetadata(BaseModel):
     """Metadata for a document to be stored in the vector database."""
     id: str = Field(..., description="Document ID")
@@ -1,20 +1,48 @@
 import os
-import json
+import orjson
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+import httpx
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 from loguru import logger
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Awaitable, Iterable, Optional, Set, Tuple
 import re
 from pathlib import Path
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, BrowserContext, Route, TimeoutError as PlaywrightTimeoutError, async_playwright
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 from tqdm.asyncio import tqdm_asyncio
 import time
+from dataclasses import dataclass, field
+
+from config import settings
 
 # Constants
 CODEX_BASE_URL = "https://ashescodex.com"
 DATA_DIR = "/data/raw/codex"
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+# Browser pages kept open per category; also the number of concurrent browser loads
+PAGES_PER_CATEGORY = 8
+# Browser page loads in flight across all categories sharing the browser
+MAX_BROWSER_LOADS = 32
+# Page loads started per second across all categories, and the burst allowed above that
+REQUESTS_PER_SECOND = 8
+REQUEST_BURST = 16
+# Attempts per page load; timeouts are retried with exponential backoff
+FETCH_ATTEMPTS = 4
+# Browser resource types the scrapers never read; blocking them also lets
+# "networkidle" fire as soon as the document and its scripts are done
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+# Scraped results waiting to be saved before scraping pauses for the writer
+WRITE_QUEUE_SIZE = 64
+
+# Runs of whitespace (indentation and line breaks from the page markup) inside a text field
+WHITESPACE = re.compile(r"\s+")
+
+# Last scrape time of every category, in one file; the leading underscore
+# keeps the chunker from treating it as a document
+SCRAPE_INDEX_PATH = f"{DATA_DIR}/_scrape_index.json"
+_scrape_index: Optional[Dict[str, float]] = None
+_scrape_index_lock = asyncio.Lock()
 
 # URLs to scrape by category
 SCRAPE_URLS = {
@@ -44,67 +72,249 @@ SCRAPE_URLS = {
     ],
 }
 
-async def save_json(data: Dict[str, Any], filename: str, category: str):
-    """Save data to a JSON file."""
-    # Create directory if it doesn't exist
-    os.makedirs(f"{DATA_DIR}/{category}", exist_ok=True)
+def _write_file(file_path: str, payload: bytes):
+    """
+    Write payload to file_path; its directory (DATA_DIR or a category
+    directory) is created before any scraping starts.
     
-    # Save the file
+    The data goes to a temporary file that is then renamed over file_path,
+    so readers never see a partially written file.
+    """
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(temp_path, file_path)
+
+async def save_json(data: Dict[str, Any], filename: str, category: str):
+    """Save data to a JSON file without blocking the event loop."""
     file_path = f"{DATA_DIR}/{category}/{filename}.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    # orjson emits UTF-8 bytes directly; the disk write runs in a worker thread
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    await asyncio.to_thread(_write_file, file_path, payload)
     
     logger.debug(f"Saved {file_path}")
 
-async def get_last_scrape_time(category: str) -> float:
-    """Get the timestamp of the last scrape for a category."""
-    timestamp_file = f"{DATA_DIR}/{category}/_last_scrape.txt"
-    
+async def json_writer(queue: asyncio.Queue, category: str):
+    """Save (filename, data) items from queue in order until a None sentinel arrives."""
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        
+        filename, data = item
+        try:
+            await save_json(data, filename, category)
+        except Exception as e:
+            logger.error(f"Error saving {filename}: {e}")
+
+def _read_scrape_index() -> Dict[str, float]:
+    """Read the category -> last scrape time index, or an empty one if there is none yet."""
     try:
-        if os.path.exists(timestamp_file):
-            with open(timestamp_file, 'r') as f:
-                return float(f.read().strip())
+        with open(SCRAPE_INDEX_PATH, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
     except Exception as e:
-        logger.error(f"Error reading last scrape time: {e}")
+        logger.error(f"Error reading last scrape times: {e}")
+        return {}
+
+async def _load_scrape_index() -> Dict[str, float]:
+    """Return the scrape index, reading it from disk on first use only."""
+    global _scrape_index
     
-    return 0  # Default to epoch start if no timestamp exists
+    if _scrape_index is None:
+        _scrape_index = await asyncio.to_thread(_read_scrape_index)
+    return _scrape_index
+
+async def get_last_scrape_time(category: str) -> float:
+    """Get the timestamp of the last scrape for a category."""
+    # Default to epoch start if the category was never scraped
+    return (await _load_scrape_index()).get(category, 0)
 
 async def update_last_scrape_time(category: str):
     """Update the timestamp of the last scrape for a category."""
-    timestamp_file = f"{DATA_DIR}/{category}/_last_scrape.txt"
+    async with _scrape_index_lock:
+        scrape_index = await _load_scrape_index()
+        scrape_index[category] = time.time()
+        
+        # Categories finish concurrently; the lock keeps an older snapshot
+        # from being written over a newer one
+        await asyncio.to_thread(_write_file, SCRAPE_INDEX_PATH, orjson.dumps(scrape_index))
+
+def _clean(node: LexborNode) -> str:
+    """Text of node with every whitespace run collapsed to one space."""
+    return WHITESPACE.sub(" ", node.text()).strip()
+
+def _text(node: LexborNode, selector: str, default: str = "") -> str:
+    """Cleaned text of the first match of selector under node, or default if there is none."""
+    match = node.css_first(selector)
+    return _clean(match) if match is not None else default
+
+def _attr(node: LexborNode, selector: str, attribute: str) -> str:
+    """Value of attribute on the first match of selector under node, or "" if missing."""
+    match = node.css_first(selector)
+    return (match.attributes.get(attribute) or "") if match is not None else ""
+
+def render_text(lines: Iterable[Tuple[str, str]]) -> str:
+    """
+    Join (label, value) pairs into "Label: value" lines for a document's text.
+    
+    Empty values are left out so they don't pad the indexed text with
+    labels that carry no information.
+    """
+    return "\n".join(f"{label}: {value}" for label, value in lines if value)
+
+class TokenBucket:
+    """
+    Asyncio token bucket rate limiter.
+    
+    Up to capacity acquisitions go through at once, after which they are
+    spaced out to rate per second. Only used from one event loop, so the
+    refill-and-take step needs no lock.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+# Shared by every category (browser and plain HTTP) so the site sees one bounded request rate
+_request_limiter = TokenBucket(REQUESTS_PER_SECOND, REQUEST_BURST)
+_browser_loads = asyncio.Semaphore(MAX_BROWSER_LOADS)
+
+async def block_unneeded_resources(route: Route):
+    """Abort browser requests for BLOCKED_RESOURCE_TYPES and let the rest through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class PageFetcher:
+    """
+    Fetches codex pages for one category.
+    
+    Server-rendered pages are fetched with a plain HTTP request, which is
+    far cheaper than a browser load. When the response lacks the content
+    the caller expects (the page is rendered client-side), the URL is
+    loaded in one of a pool of browser pages instead. Waiting for a free
+    page bounds concurrent browser loads to the pool size, and reusing
+    pages saves a browser round-trip per URL. Every request waits for the
+    shared rate limiter, and timeouts are retried.
+    """
     
-    # Create directory if it doesn't exist
-    os.makedirs(f"{DATA_DIR}/{category}", exist_ok=True)
+    def __init__(self, client: httpx.AsyncClient, pages: asyncio.Queue):
+        self.client = client
+        self.pages = pages
     
-    # Update timestamp
-    with open(timestamp_file, 'w') as f:
-        f.write(str(time.time()))
+    @classmethod
+    async def open(cls, client: httpx.AsyncClient, context: BrowserContext, size: int) -> "PageFetcher":
+        """Create a fetcher with size browser pages opened in context."""
+        pages = asyncio.Queue()
+        for _ in range(size):
+            pages.put_nowait(await context.new_page())
+        return cls(client, pages)
+    
+    async def fetch(self, url: str, probe: Optional[str] = None) -> LexborHTMLParser:
+        """
+        Return the parsed HTML of url.
+        
+        The tree parsed to check the probe is the one returned, so callers
+        never parse a page twice.
+        
+        Args:
+            url: Absolute URL to fetch
+            probe: CSS selector the page must match to be used without a
+                browser; without one the page is always loaded in the browser
+        """
+        if probe is not None:
+            content = await self._fetch_static(url)
+            if content is not None:
+                soup = LexborHTMLParser(content)
+                if soup.css_first(probe) is not None:
+                    return soup
+        
+        return LexborHTMLParser(await self._fetch_rendered(url))
+    
+    async def _fetch_static(self, url: str) -> Optional[str]:
+        """Fetch url over plain HTTP, or None if that fails."""
+        await _request_limiter.acquire()
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            return response.text
+        except httpx.HTTPError as e:
+            logger.debug(f"Static fetch of {url} failed, using the browser: {e}")
+            return None
+    
+    async def _fetch_rendered(self, url: str) -> str:
+        """Load url in a pooled browser page and return the rendered HTML."""
+        page_obj = await self.pages.get()
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(FETCH_ATTEMPTS),
+                wait=wait_exponential(multiplier=1, max=8),
+                retry=retry_if_exception_type(PlaywrightTimeoutError),
+                reraise=True,
+            ):
+                with attempt:
+                    await _request_limiter.acquire()
+                    async with _browser_loads:
+                        await page_obj.goto(url)
+                        await page_obj.wait_for_load_state("networkidle")
+                        return await page_obj.content()
+        finally:
+            self.pages.put_nowait(page_obj)
 
-async def scrape_items_page(url: str, category: str, page: int = 1, browser=None) -> List[Dict[str, Any]]:
-    """Scrape items from a paginated list."""
+def _last_page_number(soup: LexborHTMLParser) -> Optional[int]:
+    """Highest page number linked from the list's pagination, or None if it shows none."""
+    numbers = [
+        int(text) for link in soup.css(".pagination a")
+        for text in (link.text(strip=True),) if text.isdigit()
+    ]
+    return max(numbers, default=None)
+
+async def scrape_items_page(
+    url: str, category: str, page: int = 1, fetcher: PageFetcher = None
+) -> Tuple[List[Dict[str, Any]], bool, Optional[int]]:
+    """
+    Scrape items from a paginated list.
+    
+    Returns:
+        The page's items, whether there is a next page, and the last page
+        number shown in the pagination (None if it shows none)
+    """
     items = []
     
     try:
         # Navigate to the page
         full_url = f"{CODEX_BASE_URL}{url}?page={page}"
-        page_obj = await browser.new_page()
-        await page_obj.goto(full_url)
-        await page_obj.wait_for_load_state("networkidle")
-        
-        # Get page content
-        content = await page_obj.content()
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = await fetcher.fetch(full_url, probe=".item-card")
         
         # Extract items
-        item_cards = soup.select(".item-card")
+        item_cards = soup.css(".item-card")
         
         for card in item_cards:
             try:
-                item_id = card.get("data-item-id", "")
-                item_name = card.select_one(".item-name").text.strip()
-                item_quality = card.select_one(".item-quality").text.strip() if card.select_one(".item-quality") else ""
-                item_type = card.select_one(".item-type").text.strip() if card.select_one(".item-type") else ""
-                item_url = card.select_one("a")["href"] if card.select_one("a") else ""
+                item_id = card.attributes.get("data-item-id") or ""
+                item_name = _clean(card.css_first(".item-name"))
+                item_quality = _text(card, ".item-quality")
+                item_type = _text(card, ".item-type")
+                item_url = _attr(card, "a", "href")
                 
                 item_data = {
                     "id": item_id,
@@ -120,122 +330,109 @@ async def scrape_items_page(url: str, category: str, page: int = 1, browser=None
                 logger.error(f"Error parsing item card: {e}")
         
         # Check if there's a next page
-        next_page = soup.select_one(".pagination .next:not(.disabled)")
-        has_next_page = bool(next_page)
-        
-        # Close the page
-        await page_obj.close()
+        next_page = soup.css_first(".pagination .next:not(.disabled)")
+        has_next_page = next_page is not None
         
-        return items, has_next_page
+        return items, has_next_page, _last_page_number(soup)
         
     except Exception as e:
         logger.error(f"Error scraping items page {url}?page={page}: {e}")
-        return [], False
+        return [], False, None
 
-async def scrape_item_details(item: Dict[str, Any], browser=None) -> Dict[str, Any]:
+async def scrape_item_details(item: Dict[str, Any], fetcher: PageFetcher = None) -> Dict[str, Any]:
     """Scrape detailed information about an item."""
     if not item.get("url"):
         return item
     
     try:
-        # Navigate to the item page
+        # Fetch the item page
         full_url = f"{CODEX_BASE_URL}{item['url']}"
-        page_obj = await browser.new_page()
-        await page_obj.goto(full_url)
-        await page_obj.wait_for_load_state("networkidle")
-        
-        # Get page content
-        content = await page_obj.content()
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Extract item details
-        item_details = {}
+        soup = await fetcher.fetch(full_url, probe="h1.item-name")
         
         # Basic info
-        item_details["name"] = soup.select_one("h1.item-name").text.strip() if soup.select_one("h1.item-name") else item.get("name", "")
-        item_details["quality"] = soup.select_one(".item-quality").text.strip() if soup.select_one(".item-quality") else item.get("quality", "")
-        item_details["type"] = soup.select_one(".item-type").text.strip() if soup.select_one(".item-type") else item.get("type", "")
+        name = _text(soup, "h1.item-name", item.get("name", ""))
+        quality = _text(soup, ".item-quality", item.get("quality", ""))
+        type_ = _text(soup, ".item-type", item.get("type", ""))
         
         # Description
-        description = soup.select_one(".item-description")
-        item_details["description"] = description.text.strip() if description else ""
+        description = _text(soup, ".item-description")
         
         # Stats
         stats = []
-        stats_section = soup.select_one(".item-stats")
-        if stats_section:
-            stat_items = stats_section.select("li")
+        stats_section = soup.css_first(".item-stats")
+        if stats_section is not None:
+            stat_items = stats_section.css("li")
             for stat in stat_items:
-                stats.append(stat.text.strip())
-        item_details["stats"] = stats
+                stats.append(_clean(stat))
         
         # Sources (how to obtain)
         sources = []
-        sources_section = soup.select_one(".item-sources")
-        if sources_section:
-            source_items = sources_section.select("li")
+        sources_section = soup.css_first(".item-sources")
+        if sources_section is not None:
+            source_items = sources_section.css("li")
             for source in source_items:
-                sources.append(source.text.strip())
-        item_details["sources"] = sources
+                sources.append(_clean(source))
         
         # Crafting recipe
         recipe = {}
-        recipe_section = soup.select_one(".item-recipe")
-        if recipe_section:
+        recipe_section = soup.css_first(".item-recipe")
+        if recipe_section is not None:
             materials = []
-            material_items = recipe_section.select(".recipe-material")
+            material_items = recipe_section.css(".recipe-material")
             for material in material_items:
-                material_name = material.select_one(".material-name").text.strip() if material.select_one(".material-name") else ""
-                material_amount = material.select_one(".material-amount").text.strip() if material.select_one(".material-amount") else ""
+                material_name = _text(material, ".material-name")
+                material_amount = _text(material, ".material-amount")
                 materials.append({
                     "name": material_name,
                     "amount": material_amount
                 })
             recipe["materials"] = materials
             
-            recipe["skill"] = recipe_section.select_one(".recipe-skill").text.strip() if recipe_section.select_one(".recipe-skill") else ""
-            recipe["level"] = recipe_section.select_one(".recipe-level").text.strip() if recipe_section.select_one(".recipe-level") else ""
-            
-        item_details["recipe"] = recipe if recipe else None
+            recipe["skill"] = _text(recipe_section, ".recipe-skill")
+            recipe["level"] = _text(recipe_section, ".recipe-level")
         
         # Used in (what crafting recipes use this item)
         used_in = []
-        used_in_section = soup.select_one(".item-used-in")
-        if used_in_section:
-            used_in_items = used_in_section.select("li")
+        used_in_section = soup.css_first(".item-used-in")
+        if used_in_section is not None:
+            used_in_items = used_in_section.css("li")
             for used in used_in_items:
-                used_in.append(used.text.strip())
-        item_details["used_in"] = used_in
+                used_in.append(_clean(used))
         
         # Locations
         locations = []
-        locations_section = soup.select_one(".item-locations")
-        if locations_section:
-            location_items = locations_section.select("li")
+        locations_section = soup.css_first(".item-locations")
+        if locations_section is not None:
+            location_items = locations_section.css("li")
             for location in location_items:
-                locations.append(location.text.strip())
-        item_details["locations"] = locations
-        
-        # Close the page
-        await page_obj.close()
+                locations.append(_clean(location))
         
-        # Merge with original item data
-        item.update(item_details)
-        
-        # Create a document structure for indexing
+        # Create a document structure for indexing straight from the parsed
+        # fields; the listing's item is copied into the metadata, not updated
         document = {
             "id": item.get("id", ""),
-            "text": f"""
-                Name: {item.get('name', '')}
-                Quality: {item.get('quality', '')}
-                Type: {item.get('type', '')}
-                Description: {item.get('description', '')}
-                Stats: {', '.join(item.get('stats', []))}
-                How to obtain: {', '.join(item.get('sources', []))}
-                Locations: {', '.join(item.get('locations', []))}
-                Used in: {', '.join(item.get('used_in', []))}
-            """,
-            "metadata": item,
+            "text": render_text((
+                ("Name", name),
+                ("Quality", quality),
+                ("Type", type_),
+                ("Description", description),
+                ("Stats", ', '.join(stats)),
+                ("How to obtain", ', '.join(sources)),
+                ("Locations", ', '.join(locations)),
+                ("Used in", ', '.join(used_in)),
+            )),
+            "metadata": {
+                **item,
+                "name": name,
+                "quality": quality,
+                "type": type_,
+                "description": description,
+                "stats": stats,
+                "sources": sources,
+                "recipe": recipe if recipe else None,
+                "used_in": used_in,
+                "locations": locations,
+            },
             "source": full_url,
             "type": "item"
         }
@@ -246,373 +443,221 @@ async def scrape_item_details(item: Dict[str, Any], browser=None) -> Dict[str, A
         logger.error(f"Error scraping item details for {item.get('name', 'unknown')}: {e}")
         return item
 
-async def scrape_location_details(url: str, category: str, browser=None) -> List[Dict[str, Any]]:
-    """Scrape detailed information about locations."""
-    locations = []
+def scrape_item_details_once(item: Dict[str, Any], fetcher: PageFetcher, scrapes: Dict[str, asyncio.Future]) -> asyncio.Future:
+    """
+    Scrape an item's details unless the same item page was already scraped this run.
     
+    /items lists every item and the /items/<type> pages list them again,
+    so without this each item page would be loaded twice. scrapes maps
+    item URLs to their (possibly still running) scrape.
+    """
+    item_url = item.get("url")
+    if not item_url:
+        return asyncio.ensure_future(scrape_item_details(item, fetcher))
+    
+    if item_url not in scrapes:
+        scrapes[item_url] = asyncio.ensure_future(scrape_item_details(item, fetcher))
+    return scrapes[item_url]
+
+@dataclass(frozen=True)
+class CardList:
+    """A repeated sub-element of a card, e.g. the materials of a recipe."""
+    selector: str
+    fields: Dict[str, str]  # output key -> CSS selector within each entry
+    item_format: str        # how one entry is written in the document text
+    separator: str          # between entries in the document text
+
+@dataclass(frozen=True)
+class CardSchema:
+    """How to turn one kind of codex card into a document."""
+    selector: str
+    id_attribute: str
+    doc_type: str
+    fields: Dict[str, str]                   # output key -> CSS selector within the card
+    text: Tuple[Tuple[str, str], ...]        # (label, output key) lines of the document text
+    lists: Dict[str, CardList] = field(default_factory=dict)
+    constants: Dict[str, str] = field(default_factory=dict)  # fixed metadata values
+
+_NAMED_DESCRIPTIONS = "{name}: {description}"
+
+CARD_SCHEMAS = {
+    "location": CardSchema(
+        selector=".location-card",
+        id_attribute="data-location-id",
+        doc_type="location",
+        fields={"name": ".location-name", "type": ".location-type", "zone": ".location-zone"},
+        text=(("Name", "name"), ("Type", "type"), ("Zone", "zone")),
+    ),
+    "recipe": CardSchema(
+        selector=".recipe-card",
+        id_attribute="data-recipe-id",
+        doc_type="crafting_recipe",
+        fields={"name": ".recipe-name", "profession": ".recipe-profession", "level": ".recipe-level"},
+        lists={"materials": CardList(
+            ".recipe-material", {"name": ".material-name", "amount": ".material-amount"}, "{amount} {name}", ", "
+        )},
+        text=(("Recipe", "name"), ("Profession", "profession"), ("Level", "level"), ("Materials", "materials")),
+    ),
+    "profession": CardSchema(
+        selector=".profession-card",
+        id_attribute="data-profession-id",
+        doc_type="crafting_profession",
+        fields={"name": ".profession-name", "type": ".profession-type", "description": ".profession-description"},
+        lists={"tiers": CardList(
+            ".profession-tier", {"name": ".tier-name", "description": ".tier-description"}, _NAMED_DESCRIPTIONS, " "
+        )},
+        text=(("Profession", "name"), ("Type", "type"), ("Description", "description"), ("Tiers", "tiers")),
+    ),
+    "archetype": CardSchema(
+        selector=".class-card",
+        id_attribute="data-class-id",
+        doc_type="archetype",
+        fields={"name": ".class-name", "description": ".class-description"},
+        constants={"type": "archetype"},
+        lists={"abilities": CardList(
+            ".class-ability", {"name": ".ability-name", "description": ".ability-description"}, _NAMED_DESCRIPTIONS, " "
+        )},
+        text=(("Archetype", "name"), ("Description", "description"), ("Abilities", "abilities")),
+    ),
+    "class": CardSchema(
+        selector=".class-card",
+        id_attribute="data-class-id",
+        doc_type="class",
+        fields={"name": ".class-name", "description": ".class-description"},
+        constants={"type": "class"},
+        lists={"abilities": CardList(
+            ".class-ability", {"name": ".ability-name", "description": ".ability-description"}, _NAMED_DESCRIPTIONS, " "
+        )},
+        text=(("Class", "name"), ("Description", "description"), ("Abilities", "abilities")),
+    ),
+    "race": CardSchema(
+        selector=".race-card",
+        id_attribute="data-race-id",
+        doc_type="race",
+        fields={"name": ".race-name", "description": ".race-description"},
+        lists={"racial_traits": CardList(
+            ".racial-trait", {"name": ".trait-name", "description": ".trait-description"}, _NAMED_DESCRIPTIONS, " "
+        )},
+        text=(("Race", "name"), ("Description", "description"), ("Racial Traits", "racial_traits")),
+    ),
+    "build": CardSchema(
+        selector=".build-card",
+        id_attribute="data-build-id",
+        doc_type="build",
+        fields={
+            "name": ".build-name",
+            "class": ".build-class",
+            "type": ".build-type",
+            "description": ".build-description",
+            "author": ".build-author",
+        },
+        text=(("Build", "name"), ("Class", "class"), ("Type", "type"), ("Author", "author"), ("Description", "description")),
+    ),
+}
+
+def parse_cards(soup: LexborHTMLParser, schema: CardSchema) -> List[Dict[str, Any]]:
+    """Build an indexable document from every card on the page matching schema."""
+    documents = []
+    
+    for card in soup.css(schema.selector):
+        try:
+            card_id = card.attributes.get(schema.id_attribute) or ""
+            card_url = _attr(card, "a", "href")
+            source = f"{CODEX_BASE_URL}{card_url}" if card_url else ""
+            
+            # Card details
+            details = {"id": card_id}
+            for key, selector in schema.fields.items():
+                details[key] = _text(card, selector)
+            details.update(schema.constants)
+            for key, card_list in schema.lists.items():
+                details[key] = [
+                    {entry_key: _text(entry, selector) for entry_key, selector in card_list.fields.items()}
+                    for entry in card.css(card_list.selector)
+                ]
+            details["url"] = card_url
+            details["source"] = source
+            
+            # Document text, one "Label: value" line per entry in schema.text
+            lines = []
+            for label, key in schema.text:
+                value = details[key]
+                if key in schema.lists:
+                    card_list = schema.lists[key]
+                    value = card_list.separator.join(card_list.item_format.format(**entry) for entry in value)
+                lines.append((label, value))
+            
+            documents.append({
+                "id": card_id,
+                "text": render_text(lines),
+                "metadata": details,
+                "source": source,
+                "type": schema.doc_type,
+            })
+        except Exception as e:
+            logger.error(f"Error parsing {schema.doc_type} card: {e}")
+    
+    return documents
+
+async def scrape_location_details(url: str, category: str, fetcher: PageFetcher = None) -> List[Dict[str, Any]]:
+    """Scrape detailed information about locations."""
     try:
         # Navigate to the page
         full_url = f"{CODEX_BASE_URL}{url}"
-        page_obj = await browser.new_page()
-        await page_obj.goto(full_url)
-        await page_obj.wait_for_load_state("networkidle")
-        
-        # Get page content
-        content = await page_obj.content()
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Extract locations
-        location_cards = soup.select(".location-card")
-        
-        for card in location_cards:
-            try:
-                location_id = card.get("data-location-id", "")
-                location_name = card.select_one(".location-name").text.strip() if card.select_one(".location-name") else ""
-                location_type = card.select_one(".location-type").text.strip() if card.select_one(".location-type") else ""
-                location_zone = card.select_one(".location-zone").text.strip() if card.select_one(".location-zone") else ""
-                location_url = card.select_one("a")["href"] if card.select_one("a") else ""
-                
-                # Extract location details if there's a URL
-                location_details = {
-                    "id": location_id,
-                    "name": location_name,
-                    "type": location_type,
-                    "zone": location_zone,
-                    "url": location_url,
-                    "source": f"{CODEX_BASE_URL}{location_url}" if location_url else "",
-                }
-                
-                # Create a document structure for indexing
-                document = {
-                    "id": location_id,
-                    "text": f"""
-                        Name: {location_name}
-                        Type: {location_type}
-                        Zone: {location_zone}
-                    """,
-                    "metadata": location_details,
-                    "source": f"{CODEX_BASE_URL}{location_url}" if location_url else "",
-                    "type": "location"
-                }
-                
-                locations.append(document)
-            except Exception as e:
-                logger.error(f"Error parsing location card: {e}")
-        
-        # Close the page
-        await page_obj.close()
+        soup = await fetcher.fetch(full_url, probe=CARD_SCHEMAS["location"].selector)
         
-        return locations
+        return parse_cards(soup, CARD_SCHEMAS["location"])
         
     except Exception as e:
         logger.error(f"Error scraping locations {url}: {e}")
         return []
 
-async def scrape_crafting_details(url: str, category: str, browser=None) -> List[Dict[str, Any]]:
+async def scrape_crafting_details(url: str, category: str, fetcher: PageFetcher = None) -> List[Dict[str, Any]]:
     """Scrape detailed information about crafting."""
-    crafting_items = []
+    if "recipes" in url:
+        schema = CARD_SCHEMAS["recipe"]
+    elif "professions" in url:
+        schema = CARD_SCHEMAS["profession"]
+    else:
+        return []
     
     try:
         # Navigate to the page
         full_url = f"{CODEX_BASE_URL}{url}"
-        page_obj = await browser.new_page()
-        await page_obj.goto(full_url)
-        await page_obj.wait_for_load_state("networkidle")
+        soup = await fetcher.fetch(full_url, probe=schema.selector)
         
-        # Get page content
-        content = await page_obj.content()
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        if "recipes" in url:
-            # Extract recipes
-            recipe_cards = soup.select(".recipe-card")
-            
-            for card in recipe_cards:
-                try:
-                    recipe_id = card.get("data-recipe-id", "")
-                    recipe_name = card.select_one(".recipe-name").text.strip() if card.select_one(".recipe-name") else ""
-                    recipe_profession = card.select_one(".recipe-profession").text.strip() if card.select_one(".recipe-profession") else ""
-                    recipe_level = card.select_one(".recipe-level").text.strip() if card.select_one(".recipe-level") else ""
-                    recipe_url = card.select_one("a")["href"] if card.select_one("a") else ""
-                    
-                    # Extract recipe materials
-                    materials = []
-                    material_items = card.select(".recipe-material")
-                    for material in material_items:
-                        material_name = material.select_one(".material-name").text.strip() if material.select_one(".material-name") else ""
-                        material_amount = material.select_one(".material-amount").text.strip() if material.select_one(".material-amount") else ""
-                        materials.append({
-                            "name": material_name,
-                            "amount": material_amount
-                        })
-                    
-                    # Recipe details
-                    recipe_details = {
-                        "id": recipe_id,
-                        "name": recipe_name,
-                        "profession": recipe_profession,
-                        "level": recipe_level,
-                        "materials": materials,
-                        "url": recipe_url,
-                        "source": f"{CODEX_BASE_URL}{recipe_url}" if recipe_url else "",
-                    }
-                    
-                    # Create a document structure for indexing
-                    materials_text = ", ".join([f"{m.get('amount', '')} {m.get('name', '')}" for m in materials])
-                    document = {
-                        "id": recipe_id,
-                        "text": f"""
-                            Recipe: {recipe_name}
-                            Profession: {recipe_profession}
-                            Level: {recipe_level}
-                            Materials: {materials_text}
-                        """,
-                        "metadata": recipe_details,
-                        "source": f"{CODEX_BASE_URL}{recipe_url}" if recipe_url else "",
-                        "type": "crafting_recipe"
-                    }
-                    
-                    crafting_items.append(document)
-                except Exception as e:
-                    logger.error(f"Error parsing recipe card: {e}")
-        
-        elif "professions" in url:
-            # Extract professions
-            profession_cards = soup.select(".profession-card")
-            
-            for card in profession_cards:
-                try:
-                    profession_id = card.get("data-profession-id", "")
-                    profession_name = card.select_one(".profession-name").text.strip() if card.select_one(".profession-name") else ""
-                    profession_type = card.select_one(".profession-type").text.strip() if card.select_one(".profession-type") else ""
-                    profession_url = card.select_one("a")["href"] if card.select_one("a") else ""
-                    
-                    # Extract profession details
-                    description = card.select_one(".profession-description").text.strip() if card.select_one(".profession-description") else ""
-                    tiers = []
-                    tier_items = card.select(".profession-tier")
-                    for tier in tier_items:
-                        tier_name = tier.select_one(".tier-name").text.strip() if tier.select_one(".tier-name") else ""
-                        tier_description = tier.select_one(".tier-description").text.strip() if tier.select_one(".tier-description") else ""
-                        tiers.append({
-                            "name": tier_name,
-                            "description": tier_description
-                        })
-                    
-                    # Profession details
-                    profession_details = {
-                        "id": profession_id,
-                        "name": profession_name,
-                        "type": profession_type,
-                        "description": description,
-                        "tiers": tiers,
-                        "url": profession_url,
-                        "source": f"{CODEX_BASE_URL}{profession_url}" if profession_url else "",
-                    }
-                    
-                    # Create a document structure for indexing
-                    tiers_text = " ".join([f"{t.get('name', '')}: {t.get('description', '')}" for t in tiers])
-                    document = {
-                        "id": profession_id,
-                        "text": f"""
-                            Profession: {profession_name}
-                            Type: {profession_type}
-                            Description: {description}
-                            Tiers: {tiers_text}
-                        """,
-                        "metadata": profession_details,
-                        "source": f"{CODEX_BASE_URL}{profession_url}" if profession_url else "",
-                        "type": "crafting_profession"
-                    }
-                    
-                    crafting_items.append(document)
-                except Exception as e:
-                    logger.error(f"Error parsing profession card: {e}")
-        
-        # Close the page
-        await page_obj.close()
-        
-        return crafting_items
+        return parse_cards(soup, schema)
         
     except Exception as e:
         logger.error(f"Error scraping crafting {url}: {e}")
         return []
 
-async def scrape_character_details(url: str, category: str, browser=None) -> List[Dict[str, Any]]:
+async def scrape_character_details(url: str, category: str, fetcher: PageFetcher = None) -> List[Dict[str, Any]]:
     """Scrape detailed information about character options."""
-    character_items = []
+    if "archetypes" in url:
+        schema = CARD_SCHEMAS["archetype"]
+    elif "classes" in url:
+        schema = CARD_SCHEMAS["class"]
+    elif "races" in url:
+        schema = CARD_SCHEMAS["race"]
+    elif "builds" in url:
+        schema = CARD_SCHEMAS["build"]
+    else:
+        return []
     
     try:
         # Navigate to the page
         full_url = f"{CODEX_BASE_URL}{url}"
-        page_obj = await browser.new_page()
-        await page_obj.goto(full_url)
-        await page_obj.wait_for_load_state("networkidle")
-        
-        # Get page content
-        content = await page_obj.content()
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        if "archetypes" in url or "classes" in url:
-            # Extract classes/archetypes
-            class_cards = soup.select(".class-card")
-            
-            for card in class_cards:
-                try:
-                    class_id = card.get("data-class-id", "")
-                    class_name = card.select_one(".class-name").text.strip() if card.select_one(".class-name") else ""
-                    class_category = "archetype" if "archetypes" in url else "class"
-                    class_url = card.select_one("a")["href"] if card.select_one("a") else ""
-                    
-                    # Extract class details
-                    description = card.select_one(".class-description").text.strip() if card.select_one(".class-description") else ""
-                    abilities = []
-                    ability_items = card.select(".class-ability")
-                    for ability in ability_items:
-                        ability_name = ability.select_one(".ability-name").text.strip() if ability.select_one(".ability-name") else ""
-                        ability_description = ability.select_one(".ability-description").text.strip() if ability.select_one(".ability-description") else ""
-                        abilities.append({
-                            "name": ability_name,
-                            "description": ability_description
-                        })
-                    
-                    # Class details
-                    class_details = {
-                        "id": class_id,
-                        "name": class_name,
-                        "type": class_category,
-                        "description": description,
-                        "abilities": abilities,
-                        "url": class_url,
-                        "source": f"{CODEX_BASE_URL}{class_url}" if class_url else "",
-                    }
-                    
-                    # Create a document structure for indexing
-                    abilities_text = " ".join([f"{a.get('name', '')}: {a.get('description', '')}" for a in abilities])
-                    document = {
-                        "id": class_id,
-                        "text": f"""
-                            {class_category.title()}: {class_name}
-                            Description: {description}
-                            Abilities: {abilities_text}
-                        """,
-                        "metadata": class_details,
-                        "source": f"{CODEX_BASE_URL}{class_url}" if class_url else "",
-                        "type": class_category
-                    }
-                    
-                    character_items.append(document)
-                except Exception as e:
-                    logger.error(f"Error parsing class card: {e}")
-        
-        elif "races" in url:
-            # Extract races
-            race_cards = soup.select(".race-card")
-            
-            for card in race_cards:
-                try:
-                    race_id = card.get("data-race-id", "")
-                    race_name = card.select_one(".race-name").text.strip() if card.select_one(".race-name") else ""
-                    race_url = card.select_one("a")["href"] if card.select_one("a") else ""
-                    
-                    # Extract race details
-                    description = card.select_one(".race-description").text.strip() if card.select_one(".race-description") else ""
-                    racial_traits = []
-                    trait_items = card.select(".racial-trait")
-                    for trait in trait_items:
-                        trait_name = trait.select_one(".trait-name").text.strip() if trait.select_one(".trait-name") else ""
-                        trait_description = trait.select_one(".trait-description").text.strip() if trait.select_one(".trait-description") else ""
-                        racial_traits.append({
-                            "name": trait_name,
-                            "description": trait_description
-                        })
-                    
-                    # Race details
-                    race_details = {
-                        "id": race_id,
-                        "name": race_name,
-                        "description": description,
-                        "racial_traits": racial_traits,
-                        "url": race_url,
-                        "source": f"{CODEX_BASE_URL}{race_url}" if race_url else "",
-                    }
-                    
-                    # Create a document structure for indexing
-                    traits_text = " ".join([f"{t.get('name', '')}: {t.get('description', '')}" for t in racial_traits])
-                    document = {
-                        "id": race_id,
-                        "text": f"""
-                            Race: {race_name}
-                            Description: {description}
-                            Racial Traits: {traits_text}
-                        """,
-                        "metadata": race_details,
-                        "source": f"{CODEX_BASE_URL}{race_url}" if race_url else "",
-                        "type": "race"
-                    }
-                    
-                    character_items.append(document)
-                except Exception as e:
-                    logger.error(f"Error parsing race card: {e}")
+        soup = await fetcher.fetch(full_url, probe=schema.selector)
         
-        elif "builds" in url:
-            # Extract build guides
-            build_cards = soup.select(".build-card")
-            
-            for card in build_cards:
-                try:
-                    build_id = card.get("data-build-id", "")
-                    build_name = card.select_one(".build-name").text.strip() if card.select_one(".build-name") else ""
-                    build_class = card.select_one(".build-class").text.strip() if card.select_one(".build-class") else ""
-                    build_url = card.select_one("a")["href"] if card.select_one("a") else ""
-                    
-                    # Extract build details
-                    description = card.select_one(".build-description").text.strip() if card.select_one(".build-description") else ""
-                    build_type = card.select_one(".build-type").text.strip() if card.select_one(".build-type") else ""
-                    author = card.select_one(".build-author").text.strip() if card.select_one(".build-author") else ""
-                    
-                    # Build details
-                    build_details = {
-                        "id": build_id,
-                        "name": build_name,
-                        "class": build_class,
-                        "type": build_type,
-                        "description": description,
-                        "author": author,
-                        "url": build_url,
-                        "source": f"{CODEX_BASE_URL}{build_url}" if build_url else "",
-                    }
-                    
-                    # Create a document structure for indexing
-                    document = {
-                        "id": build_id,
-                        "text": f"""
-                            Build: {build_name}
-                            Class: {build_class}
-                            Type: {build_type}
-                            Author: {author}
-                            Description: {description}
-                        """,
-                        "metadata": build_details,
-                        "source": f"{CODEX_BASE_URL}{build_url}" if build_url else "",
-                        "type": "build"
-                    }
-                    
-                    character_items.append(document)
-                except Exception as e:
-                    logger.error(f"Error parsing build card: {e}")
-        
-        # Close the page
-        await page_obj.close()
-        
-        return character_items
+        return parse_cards(soup, schema)
         
     except Exception as e:
         logger.error(f"Error scraping character {url}: {e}")
         return []
 
-async def process_category(category: str, urls: List[str], force_full: bool = False):
-    """Process a category of URLs."""
+async def process_category(category: str, urls: List[str], browser: Browser, client: httpx.AsyncClient, force_full: bool = False):
+    """Process a category of URLs in its own context of the shared browser."""
     try:
         # Create category directory
         os.makedirs(f"{DATA_DIR}/{category}", exist_ok=True)
@@ -626,78 +671,125 @@ async def process_category(category: str, urls: List[str], force_full: bool = Fa
             logger.info(f"Skipping {category} - scraped recently")
             return
         
-        # Initialize playwright
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(user_agent=USER_AGENT)
+        try:
+            await context.route("**/*", block_unneeded_resources)
+            fetcher = await PageFetcher.open(client, context, PAGES_PER_CATEGORY)
             
             all_documents = []
+            # Item detail scrapes by item URL, shared by every items listing
+            item_scrapes: Dict[str, asyncio.Future] = {}
             
-            for url in urls:
-                if "items" in url:
-                    # Handle paginated items
-                    page = 1
-                    has_next_page = True
-                    
-                    while has_next_page:
-                        items, has_next_page = await scrape_items_page(url, category, page, browser)
+            # Files are saved by one writer task, so scraping never waits on disk
+            write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+            writer = asyncio.create_task(json_writer(write_queue, category))
+            
+            try:
+                for url in urls:
+                    if "items" in url:
+                        # Handle paginated items. Page 1's pagination shows the page count, so
+                        # later pages are requested PAGES_PER_CATEGORY at a time without
+                        # probing past the last one (an empty page would fall back to the browser)
+                        items, has_next_page, last_page = await scrape_items_page(url, category, 1, fetcher)
+                        listed_pages = [(1, items)]
+                        page = 2
                         
-                        # Get details for each item
-                        detailed_items = []
-                        for item in items:
-                            detailed_item = await scrape_item_details(item, browser)
-                            detailed_items.append(detailed_item)
+                        while listed_pages:
+                            # Get details for every item in the window, loading up to PAGES_PER_CATEGORY at once
+                            detailed = await asyncio.gather(
+                                *(
+                                    scrape_item_details_once(item, fetcher, item_scrapes)
+                                    for _, items in listed_pages for item in items
+                                )
+                            )
+                            
+                            offset = 0
+                            for number, items in listed_pages:
+                                detailed_items = list(detailed[offset:offset + len(items)])
+                                offset += len(items)
+                                
+                                # Save items
+                                page_filename = f"{url.replace('/', '_')}_page_{number}"
+                                await write_queue.put((page_filename, detailed_items))
+                                
+                                all_documents.extend(detailed_items)
+                            
+                            if last_page is not None and page <= last_page:
+                                window = range(page, min(page + PAGES_PER_CATEGORY, last_page + 1))
+                                results = await asyncio.gather(
+                                    *(scrape_items_page(url, category, number, fetcher) for number in window)
+                                )
+                                
+                                # Later pages may link further pages than page 1 did
+                                listed_pages = []
+                                for number, (items, has_next_page, shown_last) in zip(window, results):
+                                    listed_pages.append((number, items))
+                                    last_page = max(last_page, shown_last or 0)
+                                page = window.stop
+                            elif has_next_page:
+                                # No page number shown this far; follow the next link one page at a time
+                                items, has_next_page, shown_last = await scrape_items_page(url, category, page, fetcher)
+                                listed_pages = [(page, items)]
+                                if shown_last is not None:
+                                    last_page = max(last_page or 0, shown_last)
+                                page += 1
+                            else:
+                                listed_pages = []
+                    
+                    elif "locations" in url or "world" in url:
+                        # Handle locations
+                        locations = await scrape_location_details(url, category, fetcher)
                         
-                        # Save items
-                        page_filename = f"{url.replace('/', '_')}_page_{page}"
-                        await save_json(detailed_items, page_filename, category)
+                        # Save locations
+                        locations_filename = f"{url.replace('/', '_')}"
+                        await write_queue.put((locations_filename, locations))
                         
-                        all_documents.extend(detailed_items)
-                        page += 1
-                
-                elif "locations" in url or "world" in url:
-                    # Handle locations
-                    locations = await scrape_location_details(url, category, browser)
-                    
-                    # Save locations
-                    locations_filename = f"{url.replace('/', '_')}"
-                    await save_json(locations, locations_filename, category)
-                    
-                    all_documents.extend(locations)
-                
-                elif "crafting" in url:
-                    # Handle crafting
-                    crafting_items = await scrape_crafting_details(url, category, browser)
+                        all_documents.extend(locations)
                     
-                    # Save crafting items
-                    crafting_filename = f"{url.replace('/', '_')}"
-                    await save_json(crafting_items, crafting_filename, category)
+                    elif "crafting" in url:
+                        # Handle crafting
+                        crafting_items = await scrape_crafting_details(url, category, fetcher)
+                        
+                        # Save crafting items
+                        crafting_filename = f"{url.replace('/', '_')}"
+                        await write_queue.put((crafting_filename, crafting_items))
+                        
+                        all_documents.extend(crafting_items)
                     
-                    all_documents.extend(crafting_items)
+                    elif "character" in url:
+                        # Handle character options
+                        character_items = await scrape_character_details(url, category, fetcher)
+                        
+                        # Save character items
+                        character_filename = f"{url.replace('/', '_')}"
+                        await write_queue.put((character_filename, character_items))
+                        
+                        all_documents.extend(character_items)
                 
-                elif "character" in url:
-                    # Handle character options
-                    character_items = await scrape_character_details(url, category, browser)
-                    
-                    # Save character items
-                    character_filename = f"{url.replace('/', '_')}"
-                    await save_json(character_items, character_filename, category)
-                    
-                    all_documents.extend(character_items)
-            
-            # Close browser
-            await browser.close()
-            
-            # Save all documents for the category
-            await save_json(all_documents, f"all_{category}", category)
+                # Save all documents for the category
+                await write_queue.put((f"all_{category}", all_documents))
+            finally:
+                # Let the writer finish what is queued, then stop
+                await write_queue.put(None)
+                await writer
             
-            # Update last scrape time
-            await update_last_scrape_time(category)
-            
-            logger.info(f"Scraped {len(all_documents)} documents from {category}")
+        finally:
+            # Close this category's pages; the browser is shared
+            await context.close()
+        
+        # Update last scrape time
+        await update_last_scrape_time(category)
+        
+        logger.info(f"Scraped {len(all_documents)} documents from {category}")
     
     except Exception as e:
         logger.error(f"Error processing category {category}: {e}")
 
+async def _run_limited(limit: asyncio.Semaphore, task: Awaitable[Any]) -> Any:
+    """Await task once limit has a free slot."""
+    async with limit:
+        return await task
+
 async def scrape_ashes_codex(force_full: bool = False):
     """Scrape data from Ashes Codex."""
     logger.info("Starting Ashes Codex scraper")
@@ -706,14 +798,28 @@ async def scrape_ashes_codex(force_full: bool = False):
         # Create base directory
         os.makedirs(DATA_DIR, exist_ok=True)
         
-        # Process each category
-        tasks = []
-        for category, urls in SCRAPE_URLS.items():
-            task = process_category(category, urls, force_full)
-            tasks.append(task)
-        
-        # Run tasks with progress reporting
-        await tqdm_asyncio.gather(*tasks, desc="Scraping Ashes Codex")
+        # Initialize playwright; every category shares the browser and HTTP client
+        # so one category's idle time (pagination, saving) is filled by the others
+        async with async_playwright() as p, httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=15,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=REQUEST_BURST, max_keepalive_connections=REQUEST_BURST),
+        ) as client:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                # Process each category, at most SCRAPE_WORKERS at a time
+                workers = asyncio.Semaphore(settings.SCRAPE_WORKERS)
+                tasks = []
+                for category, urls in SCRAPE_URLS.items():
+                    task = _run_limited(workers, process_category(category, urls, browser, client, force_full))
+                    tasks.append(task)
+                
+                # Run tasks with progress reporting
+                await tqdm_asyncio.gather(*tasks, desc="Scraping Ashes Codex")
+            finally:
+                # Close browser
+                await browser.close()
         
         logger.info("Completed Ashes Codex scraping")
         
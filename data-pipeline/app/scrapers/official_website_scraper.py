@@ -1,28 +1,45 @@
 import os
-import json
+import orjson
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+import hashlib
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
 from loguru import logger
 from typing import List, Dict, Any, Optional, Set
 import re
 import time
 from pathlib import Path
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, Playwright, Route, async_playwright
 from tqdm.asyncio import tqdm
 import uuid
 
+from pydantic import BaseModel
+
 from config import settings
 from schemas import (
     Race, RacialTrait, Archetype, Class, 
-    Document, DocumentMetadata, Zone
+    Document, DocumentMetadata, Zone, NewsArticle
 )
 
 # Constants
 OFFICIAL_BASE_URL = settings.OFFICIAL_URL
 DATA_DIR = os.path.join(settings.RAW_DATA_DIR, "official")
 USER_AGENT = settings.USER_AGENT
+# ETag / Last-Modified and content hash of each page as of its saved documents; the leading
+# underscore keeps the chunker from treating it as a document
+VALIDATORS_PATH = os.path.join(DATA_DIR, "_conditional_cache.json")
+# The only parts of each page the scrapers read; nothing outside them is built into the tree
+MAIN_CONTENT = SoupStrainer(class_="main-content")
+NEWS_ARTICLES = SoupStrainer(class_="news-article")
+# "Primary + Secondary" archetype pair of a class
+ARCHETYPE_PAIR = re.compile(r'(\w+)\s*\+\s*(\w+)')
+# Browser resource types the scrapers never read; blocking them also lets
+# "networkidle" fire as soon as the document and its scripts are done
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+# Namespace of the name-based IDs given to scraped races, classes, zones and articles
+ENTITY_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, OFFICIAL_BASE_URL)
 
 # URLs to scrape by category
 SCRAPE_URLS = {
@@ -33,54 +50,235 @@ SCRAPE_URLS = {
     "media": ["/media/latest-news"]
 }
 
-async def save_json(data: Any, filename: str, category: str):
-    """Save data to a JSON file."""
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.join(DATA_DIR, category), exist_ok=True)
+def _has_class(html: str, class_name: str) -> bool:
+    """
+    Whether html has an element with class_name, checked with a regex on
+    class attributes instead of parsing the page a second time.
+    """
+    pattern = rf'class\s*=\s*["\'][^"\']*(?<![\w-]){re.escape(class_name)}(?![\w-])'
+    return re.search(pattern, html) is not None
+
+def _write_file(file_path: str, payload: bytes):
+    """
+    Write payload to file_path; scrape_official_website creates the
+    category directories up front.
     
-    # Save the file
+    The data goes to a temporary file that is then renamed over file_path,
+    so a saved documents file reused for an unchanged page is never
+    partially written.
+    """
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(temp_path, file_path)
+
+def _model_to_json(obj: Any) -> Any:
+    """orjson fallback serializer: dump pydantic models as they are reached."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+async def save_json(data: Any, filename: str, category: str):
+    """Save data (which may contain pydantic models) to a JSON file without blocking the event loop."""
     file_path = os.path.join(DATA_DIR, category, f"{filename}.json")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    # orjson emits UTF-8 bytes directly and dumps models as it reaches them,
+    # so callers don't build a list of dicts first; the disk write runs in a worker thread
+    payload = orjson.dumps(data, default=_model_to_json, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    await asyncio.to_thread(_write_file, file_path, payload)
     
     logger.debug(f"Saved {file_path}")
 
-async def get_last_scrape_time(category: str) -> float:
-    """Get the timestamp of the last scrape for a category."""
-    timestamp_file = os.path.join(DATA_DIR, category, "_last_scrape.txt")
+def entity_id(kind: str, key: str) -> str:
+    """
+    Stable ID of a scraped entity.
     
+    Derived from the entity's kind and name (or URL), so the same race,
+    class or article keeps its ID, and its documents keep theirs, from
+    one scrape to the next.
+    """
+    return str(uuid.uuid5(ENTITY_NAMESPACE, f"{kind}|{key}"))
+
+def _read_validators() -> Dict[str, Dict[str, str]]:
+    """Read the URL -> HTTP validators map, or an empty one if there is none yet."""
+    try:
+        with open(VALIDATORS_PATH, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error(f"Error reading page validators: {e}")
+        return {}
+
+def _load_documents(file_path: str) -> List[Document]:
+    """Load documents saved by a previous scrape."""
+    with open(file_path, 'rb') as f:
+        data = orjson.loads(f.read())
+    return [Document(**doc) for doc in data]
+
+def _read_scrape_time(timestamp_file: str) -> float:
+    """Read a last scrape timestamp file, or 0 (the epoch) if there is none."""
     try:
-        if os.path.exists(timestamp_file):
-            with open(timestamp_file, 'r') as f:
-                return float(f.read().strip())
+        with open(timestamp_file, 'rb') as f:
+            return float(f.read().strip())
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.error(f"Error reading last scrape time: {e}")
     
     return 0  # Default to epoch start if no timestamp exists
 
+async def get_last_scrape_time(category: str) -> float:
+    """Get the timestamp of the last scrape for a category."""
+    timestamp_file = os.path.join(DATA_DIR, category, "_last_scrape.txt")
+    return await asyncio.to_thread(_read_scrape_time, timestamp_file)
+
 async def update_last_scrape_time(category: str):
     """Update the timestamp of the last scrape for a category."""
     timestamp_file = os.path.join(DATA_DIR, category, "_last_scrape.txt")
     
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.join(DATA_DIR, category), exist_ok=True)
-    
     # Update timestamp
-    with open(timestamp_file, 'w') as f:
-        f.write(str(time.time()))
+    await asyncio.to_thread(_write_file, timestamp_file, str(time.time()).encode())
+
+async def block_unneeded_resources(route: Route):
+    """Abort browser requests for BLOCKED_RESOURCE_TYPES and let the rest through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class PageLoader:
+    """
+    Loads pages of the official site.
+    
+    The pages are server-rendered, so each is fetched with a plain HTTP
+    request first. Chromium is only launched (once, on first need) for a
+    page whose response lacks the content its scraper looks for; such a
+    page is loaded in its own browser context so concurrent scrapers can
+    share the browser.
+    """
+    
+    def __init__(self, client: httpx.AsyncClient, playwright: Playwright, validators: Dict[str, Dict[str, str]]):
+        self.client = client
+        self.playwright = playwright
+        # URL -> ETag / Last-Modified and SHA-256 of the page the saved documents came from
+        self.validators = validators
+        # Pages requested, and those of them that were unchanged and not parsed again
+        self.pages_fetched = 0
+        self.pages_unchanged = 0
+        # Validators of this run's responses, kept once their documents are saved
+        self._fetched: Dict[str, Dict[str, str]] = {}
+        self._browser: Optional[Browser] = None
+        self._browser_lock = asyncio.Lock()
+    
+    async def fetch(self, path: str, probe_class: str, documents_file: Optional[str] = None) -> Optional[str]:
+        """
+        Return the HTML of path on the official site.
+        
+        Args:
+            path: Site path, e.g. "/races"
+            probe_class: Class an element of the plain HTTP response must
+                have for it to be used; otherwise the page is rendered in
+                the browser
+            documents_file: Documents saved from this page by the last
+                scrape; while it exists the page can be reported unchanged
+        
+        Returns:
+            The page HTML, or None if the page is unchanged since
+            documents_file was saved: the server answers the conditional
+            request with 304, or the HTML hashes the same as before
+        """
+        url = f"{OFFICIAL_BASE_URL}{path}"
+        self.pages_fetched += 1
+        validators = self.validators.get(url, {})
+        reusable = documents_file is not None and os.path.exists(documents_file)
+        headers = {}
+        if reusable:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        
+        content = None
+        fetched = {}
+        try:
+            response = await self.client.get(url, headers=headers)
+            if response.status_code == 304:
+                logger.info(f"{url} not modified, reusing saved documents")
+                self.pages_unchanged += 1
+                return None
+            response.raise_for_status()
+            if _has_class(response.text, probe_class):
+                content = response.text
+                fetched = {
+                    "etag": response.headers.get("ETag", ""),
+                    "last_modified": response.headers.get("Last-Modified", ""),
+                }
+            else:
+                logger.debug(f"{url} has no .{probe_class} without JavaScript, using the browser")
+        except httpx.HTTPError as e:
+            logger.debug(f"Static fetch of {url} failed, using the browser: {e}")
+        
+        if content is None:
+            content = await self._fetch_rendered(url)
+        
+        # Servers that don't send validators still serve identical bytes for an unchanged page
+        fetched["sha256"] = hashlib.sha256(content.encode()).hexdigest()
+        if reusable and fetched["sha256"] == validators.get("sha256"):
+            logger.info(f"{url} unchanged, reusing saved documents")
+            self.pages_unchanged += 1
+            return None
+        
+        self._fetched[url] = fetched
+        return content
+    
+    async def _fetch_rendered(self, url: str) -> str:
+        """Load url in a fresh context of the browser and return the rendered HTML."""
+        async with self._browser_lock:
+            if self._browser is None:
+                self._browser = await self.playwright.chromium.launch(headless=True)
+        
+        context = await self._browser.new_context(user_agent=USER_AGENT)
+        try:
+            await context.route("**/*", block_unneeded_resources)
+            page = await context.new_page()
+            await page.goto(url, wait_until="networkidle")
+            return await page.content()
+        finally:
+            await context.close()
+    
+    def remember(self, path: str):
+        """
+        Keep the validators of path's response now that its documents are saved.
+        
+        A page loaded in the browser has only its hash, which clears any
+        ETag left from an earlier run so it can't match documents it
+        didn't produce.
+        """
+        url = f"{OFFICIAL_BASE_URL}{path}"
+        self.validators[url] = self._fetched.pop(url, {})
+    
+    async def save_validators(self):
+        """Write the validators to disk for the next run's conditional requests."""
+        payload = orjson.dumps(self.validators, option=orjson.OPT_INDENT_2)
+        await asyncio.to_thread(_write_file, VALIDATORS_PATH, payload)
+    
+    async def close(self):
+        """Close the browser if one was launched."""
+        if self._browser is not None:
+            await self._browser.close()
 
-async def scrape_races_page(browser):
+async def scrape_races_page(loader: PageLoader, timestamp: str):
     """Scrape information about playable races."""
     try:
         logger.info("Scraping races data")
         
-        # Navigate to the races page
-        page = await browser.new_page()
-        await page.goto(f"{OFFICIAL_BASE_URL}/races", wait_until="networkidle")
-        
-        # Extract the page content
-        content = await page.content()
-        soup = BeautifulSoup(content, 'html.parser')
+        # Fetch the races page, unless it is unchanged since its documents were saved
+        documents_file = os.path.join(DATA_DIR, "races", "race_documents.json")
+        content = await loader.fetch("/races", probe_class="main-content", documents_file=documents_file)
+        if content is None:
+            return await asyncio.to_thread(_load_documents, documents_file)
+        soup = BeautifulSoup(content, 'lxml', parse_only=MAIN_CONTENT)
         
         # Find the main content section
         main_content = soup.select_one('.main-content')
@@ -120,7 +318,7 @@ async def scrape_races_page(browser):
                 
                 # Create race object
                 race = Race(
-                    id=str(uuid.uuid4()),
+                    id=entity_id("race", race_name),
                     name=race_name,
                     description=race_description,
                     racial_traits=racial_traits
@@ -135,17 +333,17 @@ async def scrape_races_page(browser):
         documents = []
         for race in races:
             # Create document for the race
-            trait_text = "\n".join([f"{trait.name}: {trait.description}" for trait in race.racial_traits])
-            
-            doc_text = f"""
-            Race: {race.name}
+            trait_text = "\n".join(f"{trait.name}: {trait.description}" for trait in race.racial_traits)
             
-            Description:
-            {race.description}
-            
-            Racial Traits:
-            {trait_text}
-            """
+            doc_text = "\n".join([
+                f"Race: {race.name}",
+                "",
+                "Description:",
+                race.description,
+                "",
+                "Racial Traits:",
+                trait_text,
+            ])
             
             document = Document(
                 id=f"race-{race.id}",
@@ -155,42 +353,38 @@ async def scrape_races_page(browser):
                     type="race",
                     source=f"{OFFICIAL_BASE_URL}/races",
                     server=None,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=timestamp
                 )
             )
             
             documents.append(document)
         
-        # Save the race data
-        race_data = [race.dict() for race in races]
-        await save_json(race_data, "races", "races")
-        
-        # Also save each document for indexing
-        await save_json([doc.dict() for doc in documents], "race_documents", "races")
+        # Save the race data, and each document for indexing, in parallel
+        await asyncio.gather(
+            save_json(races, "races", "races"),
+            save_json(documents, "race_documents", "races"),
+        )
+        loader.remember("/races")
         
         logger.info(f"Scraped {len(races)} races from official website")
         
-        # Close the page
-        await page.close()
-        
         return documents
     
     except Exception as e:
         logger.error(f"Error scraping races page: {e}")
         return []
 
-async def scrape_archetypes_page(browser):
+async def scrape_archetypes_page(loader: PageLoader, timestamp: str):
     """Scrape information about character archetypes and classes."""
     try:
         logger.info("Scraping archetypes data")
         
-        # Navigate to the archetypes page
-        page = await browser.new_page()
-        await page.goto(f"{OFFICIAL_BASE_URL}/archetypes", wait_until="networkidle")
-        
-        # Extract the page content
-        content = await page.content()
-        soup = BeautifulSoup(content, 'html.parser')
+        # Fetch the archetypes page, unless it is unchanged since its documents were saved
+        documents_file = os.path.join(DATA_DIR, "archetypes", "archetype_documents.json")
+        content = await loader.fetch("/archetypes", probe_class="main-content", documents_file=documents_file)
+        if content is None:
+            return await asyncio.to_thread(_load_documents, documents_file)
+        soup = BeautifulSoup(content, 'lxml', parse_only=MAIN_CONTENT)
         
         # Find the main content section
         main_content = soup.select_one('.main-content')
@@ -214,7 +408,7 @@ async def scrape_archetypes_page(browser):
                 
                 # Create archetype object
                 archetype = Archetype(
-                    id=str(uuid.uuid4()),
+                    id=entity_id("archetype", archetype_name),
                     name=archetype_name,
                     description=archetype_description
                 )
@@ -239,7 +433,7 @@ async def scrape_archetypes_page(browser):
                 if archetypes_elem:
                     archetype_text = archetypes_elem.text.strip()
                     # Try to parse "Primary + Secondary" format
-                    match = re.search(r'(\w+)\s*\+\s*(\w+)', archetype_text)
+                    match = ARCHETYPE_PAIR.search(archetype_text)
                     if match:
                         primary = match.group(1).strip()
                         secondary = match.group(2).strip()
@@ -257,7 +451,7 @@ async def scrape_archetypes_page(browser):
                 
                 # Create class object
                 class_obj = Class(
-                    id=str(uuid.uuid4()),
+                    id=entity_id("class", class_name),
                     name=class_name,
                     primary=primary,
                     secondary=secondary,
@@ -274,12 +468,12 @@ async def scrape_archetypes_page(browser):
         
         # Add archetype documents
         for archetype in archetypes:
-            doc_text = f"""
-            Archetype: {archetype.name}
-            
-            Description:
-            {archetype.description}
-            """
+            doc_text = "\n".join([
+                f"Archetype: {archetype.name}",
+                "",
+                "Description:",
+                archetype.description,
+            ])
             
             document = Document(
                 id=f"archetype-{archetype.id}",
@@ -289,7 +483,7 @@ async def scrape_archetypes_page(browser):
                     type="archetype",
                     source=f"{OFFICIAL_BASE_URL}/archetypes",
                     server=None,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=timestamp
                 )
             )
             
@@ -297,14 +491,14 @@ async def scrape_archetypes_page(browser):
         
         # Add class documents
         for class_obj in classes:
-            doc_text = f"""
-            Class: {class_obj.name}
-            Primary Archetype: {class_obj.primary}
-            Secondary Archetype: {class_obj.secondary}
-            
-            Description:
-            {class_obj.description}
-            """
+            doc_text = "\n".join([
+                f"Class: {class_obj.name}",
+                f"Primary Archetype: {class_obj.primary}",
+                f"Secondary Archetype: {class_obj.secondary}",
+                "",
+                "Description:",
+                class_obj.description,
+            ])
             
             document = Document(
                 id=f"class-{class_obj.id}",
@@ -314,45 +508,39 @@ async def scrape_archetypes_page(browser):
                     type="class",
                     source=f"{OFFICIAL_BASE_URL}/archetypes",
                     server=None,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=timestamp
                 )
             )
             
             documents.append(document)
         
-        # Save the archetype and class data
-        archetype_data = [archetype.dict() for archetype in archetypes]
-        class_data = [class_obj.dict() for class_obj in classes]
-        
-        await save_json(archetype_data, "archetypes", "archetypes")
-        await save_json(class_data, "classes", "archetypes")
-        
-        # Also save each document for indexing
-        await save_json([doc.dict() for doc in documents], "archetype_documents", "archetypes")
+        # Save the archetype and class data, and each document for indexing, in parallel
+        await asyncio.gather(
+            save_json(archetypes, "archetypes", "archetypes"),
+            save_json(classes, "classes", "archetypes"),
+            save_json(documents, "archetype_documents", "archetypes"),
+        )
+        loader.remember("/archetypes")
         
         logger.info(f"Scraped {len(archetypes)} archetypes and {len(classes)} classes from official website")
         
-        # Close the page
-        await page.close()
-        
         return documents
     
     except Exception as e:
         logger.error(f"Error scraping archetypes page: {e}")
         return []
 
-async def scrape_world_page(browser):
+async def scrape_world_page(loader: PageLoader, timestamp: str):
     """Scrape information about the game world."""
     try:
         logger.info("Scraping world data")
         
-        # Navigate to the world page
-        page = await browser.new_page()
-        await page.goto(f"{OFFICIAL_BASE_URL}/world", wait_until="networkidle")
-        
-        # Extract the page content
-        content = await page.content()
-        soup = BeautifulSoup(content, 'html.parser')
+        # Fetch the world page, unless it is unchanged since its documents were saved
+        documents_file = os.path.join(DATA_DIR, "world", "world_documents.json")
+        content = await loader.fetch("/world", probe_class="main-content", documents_file=documents_file)
+        if content is None:
+            return await asyncio.to_thread(_load_documents, documents_file)
+        soup = BeautifulSoup(content, 'lxml', parse_only=MAIN_CONTENT)
         
         # Find the main content section
         main_content = soup.select_one('.main-content')
@@ -396,7 +584,7 @@ async def scrape_world_page(browser):
                 
                 # Create zone object
                 zone = Zone(
-                    id=str(uuid.uuid4()),
+                    id=entity_id("zone", zone_name),
                     name=zone_name,
                     type=zone_type,
                     region=zone_region,
@@ -419,21 +607,21 @@ async def scrape_world_page(browser):
             poi_text = "\n".join(zone.points_of_interest) if zone.points_of_interest else ""
             resources_text = "\n".join(zone.resources) if zone.resources else ""
             
-            doc_text = f"""
-            Zone: {zone.name}
-            Type: {zone.type}
-            Region: {zone.region}
-            Level Range: {zone.level_range or 'Unknown'}
-            
-            Description:
-            {zone.description}
-            
-            Points of Interest:
-            {poi_text}
-            
-            Resources:
-            {resources_text}
-            """
+            doc_text = "\n".join([
+                f"Zone: {zone.name}",
+                f"Type: {zone.type}",
+                f"Region: {zone.region}",
+                f"Level Range: {zone.level_range or 'Unknown'}",
+                "",
+                "Description:",
+                zone.description,
+                "",
+                "Points of Interest:",
+                poi_text,
+                "",
+                "Resources:",
+                resources_text,
+            ])
             
             document = Document(
                 id=f"zone-{zone.id}",
@@ -443,42 +631,38 @@ async def scrape_world_page(browser):
                     type="zone",
                     source=f"{OFFICIAL_BASE_URL}/world",
                     server=None,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=timestamp
                 )
             )
             
             documents.append(document)
         
-        # Save the zone data
-        zone_data = [zone.dict() for zone in zones]
-        await save_json(zone_data, "zones", "world")
-        
-        # Also save each document for indexing
-        await save_json([doc.dict() for doc in documents], "world_documents", "world")
+        # Save the zone data, and each document for indexing, in parallel
+        await asyncio.gather(
+            save_json(zones, "zones", "world"),
+            save_json(documents, "world_documents", "world"),
+        )
+        loader.remember("/world")
         
         logger.info(f"Scraped {len(zones)} zones from official website")
         
-        # Close the page
-        await page.close()
-        
         return documents
     
     except Exception as e:
         logger.error(f"Error scraping world page: {e}")
         return []
 
-async def scrape_news_page(browser, limit: int = 10):
+async def scrape_news_page(loader: PageLoader, timestamp: str, limit: int = 10):
     """Scrape recent news articles."""
     try:
         logger.info("Scraping news data")
         
-        # Navigate to the news page
-        page = await browser.new_page()
-        await page.goto(f"{OFFICIAL_BASE_URL}/media/latest-news", wait_until="networkidle")
-        
-        # Extract the page content
-        content = await page.content()
-        soup = BeautifulSoup(content, 'html.parser')
+        # Fetch the news page, unless it is unchanged since its documents were saved
+        documents_file = os.path.join(DATA_DIR, "media", "news_documents.json")
+        content = await loader.fetch("/media/latest-news", probe_class="news-article", documents_file=documents_file)
+        if content is None:
+            return await asyncio.to_thread(_load_documents, documents_file)
+        soup = BeautifulSoup(content, 'lxml', parse_only=NEWS_ARTICLES)
         
         # Find the news article sections
         article_sections = soup.select('.news-article')[:limit]  # Limit to the most recent articles
@@ -507,14 +691,14 @@ async def scrape_news_page(browser, limit: int = 10):
                 summary = summary_elem.text.strip() if summary_elem else ""
                 
                 # Create article object
-                article = {
-                    "id": str(uuid.uuid4()),
-                    "title": title,
-                    "date": date,
-                    "url": url,
-                    "summary": summary,
-                    "content": None  # Full content would require visiting each article page
-                }
+                article = NewsArticle(
+                    id=entity_id("news", url or f"{title}|{date}"),
+                    title=title,
+                    date=date,
+                    url=url,
+                    summary=summary,
+                    content=None  # Full content would require visiting each article page
+                )
                 
                 articles.append(article)
                 
@@ -524,41 +708,39 @@ async def scrape_news_page(browser, limit: int = 10):
         # Create documents for vector storage
         documents = []
         for article in articles:
-            doc_text = f"""
-            News Article: {article['title']}
-            Date: {article['date']}
-            
-            Summary:
-            {article['summary']}
-            
-            Read more: {article['url']}
-            """
+            doc_text = "\n".join([
+                f"News Article: {article.title}",
+                f"Date: {article.date}",
+                "",
+                "Summary:",
+                article.summary,
+                "",
+                f"Read more: {article.url}",
+            ])
             
             document = Document(
-                id=f"news-{article['id']}",
+                id=f"news-{article.id}",
                 text=doc_text.strip(),
                 metadata=DocumentMetadata(
-                    id=article['id'],
+                    id=article.id,
                     type="news",
-                    source=article['url'] or f"{OFFICIAL_BASE_URL}/media/latest-news",
+                    source=article.url or f"{OFFICIAL_BASE_URL}/media/latest-news",
                     server=None,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=timestamp
                 )
             )
             
             documents.append(document)
         
-        # Save the news data
-        await save_json(articles, "news", "media")
-        
-        # Also save each document for indexing
-        await save_json([doc.dict() for doc in documents], "news_documents", "media")
+        # Save the news data, and each document for indexing, in parallel
+        await asyncio.gather(
+            save_json(articles, "news", "media"),
+            save_json(documents, "news_documents", "media"),
+        )
+        loader.remember("/media/latest-news")
         
         logger.info(f"Scraped {len(articles)} news articles from official website")
         
-        # Close the page
-        await page.close()
-        
         return documents
     
     except Exception as e:
@@ -570,43 +752,55 @@ async def scrape_official_website(force_full: bool = False):
     logger.info("Starting official website scraper")
     
     try:
-        # Create base directory if it doesn't exist
-        os.makedirs(DATA_DIR, exist_ok=True)
-        
-        # Initialize browser
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            
-            # Track all documents for combined storage
-            all_documents = []
-            
-            # Scrape races
-            race_docs = await scrape_races_page(browser)
-            all_documents.extend(race_docs)
-            
-            # Scrape archetypes and classes
-            archetype_docs = await scrape_archetypes_page(browser)
-            all_documents.extend(archetype_docs)
-            
-            # Scrape world information
-            world_docs = await scrape_world_page(browser)
-            all_documents.extend(world_docs)
+        # Create the base and category directories once, rather than on every write
+        for category in SCRAPE_URLS:
+            os.makedirs(os.path.join(DATA_DIR, category), exist_ok=True)
+        
+        # Initialize the HTTP client; the browser is only launched if a page needs it
+        async with async_playwright() as p, httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=settings.REQUEST_TIMEOUT,
+            follow_redirects=True,
+        ) as client:
+            # A full scrape ignores the saved validators, so every page is parsed again
+            validators = {} if force_full else await asyncio.to_thread(_read_validators)
+            loader = PageLoader(client, p, validators)
             
-            # Scrape news
-            news_docs = await scrape_news_page(browser)
-            all_documents.extend(news_docs)
+            # Every document of the run carries the same scrape timestamp
+            run_timestamp = datetime.now().isoformat()
             
-            # Save all documents in a single file for easier processing
-            await save_json([doc.dict() for doc in all_documents], "all_documents", "")
+            try:
+                # Scrape races, archetypes and classes, world information and news
+                # concurrently; most of each scrape is spent waiting on the network
+                page_docs = await asyncio.gather(
+                    scrape_races_page(loader, run_timestamp),
+                    scrape_archetypes_page(loader, run_timestamp),
+                    scrape_world_page(loader, run_timestamp),
+                    scrape_news_page(loader, run_timestamp),
+                )
+                await loader.save_validators()
+            finally:
+                # Close the browser
+                await loader.close()
             
-            # Update last scrape time for each category
-            for category in SCRAPE_URLS.keys():
-                await update_last_scrape_time(category)
+            # Track all documents for combined storage
+            all_documents = [doc for docs in page_docs for doc in docs]
             
-            # Close the browser
-            await browser.close()
+            # Save all documents in a single file for easier processing, and
+            # update the last scrape time of each category alongside it. When
+            # every page was unchanged the saved file already holds these documents.
+            writes = [update_last_scrape_time(category) for category in SCRAPE_URLS]
+            all_documents_file = os.path.join(DATA_DIR, "all_documents.json")
+            if loader.pages_unchanged == loader.pages_fetched and os.path.exists(all_documents_file):
+                logger.info("No official site pages changed, keeping the saved all_documents.json")
+            else:
+                writes.append(save_json(all_documents, "all_documents", ""))
+            await asyncio.gather(*writes)
             
-            logger.info(f"Completed official website scraping with {len(all_documents)} documents")
+            logger.info(
+                f"Completed official website scraping with {len(all_documents)} documents "
+                f"({loader.pages_fetched - loader.pages_unchanged} of {loader.pages_fetched} pages parsed)"
+            )
             
     except Exception as e:
         logger.error(f"Error in official website scraper: {e}")
@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 import asyncio
 import aiohttp
 from bs4 import BeautifulSoup
@@ -7,7 +7,7 @@ from loguru import logger
 from typing import List, Dict, Any, Set
 import re
 from pathlib import Path
-from playwright.async_api import async_playwright
+from playwright.async_api import Page, async_playwright
 from tqdm.asyncio import tqdm_asyncio
 import time
 
@@ -106,53 +106,55 @@ CATEGORIES = {
     ]
 }
 
+def _write_file(file_path: str, payload: bytes):
+    """Write payload to file_path; process_category creates the directory up front."""
+    with open(file_path, 'wb') as f:
+        f.write(payload)
+
 async def save_json(data: Dict[str, Any], filename: str, category: str):
-    """Save data to a JSON file."""
-    # Create directory if it doesn't exist
-    os.makedirs(f"{DATA_DIR}/{category}", exist_ok=True)
-    
-    # Save the file
+    """Save data to a JSON file without blocking the event loop."""
     file_path = f"{DATA_DIR}/{category}/{filename}.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    # orjson emits UTF-8 bytes directly; the disk write runs in a worker thread
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    await asyncio.to_thread(_write_file, file_path, payload)
     
     logger.debug(f"Saved {file_path}")
 
-async def get_last_scrape_time(category: str) -> float:
-    """Get the timestamp of the last scrape for a category."""
-    timestamp_file = f"{DATA_DIR}/{category}/_last_scrape.txt"
-    
+def _read_scrape_time(timestamp_file: str) -> float:
+    """Read a last scrape timestamp file, or 0 (the epoch) if there is none."""
     try:
-        if os.path.exists(timestamp_file):
-            with open(timestamp_file, 'r') as f:
-                return float(f.read().strip())
+        with open(timestamp_file, 'rb') as f:
+            return float(f.read().strip())
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.error(f"Error reading last scrape time: {e}")
     
     return 0  # Default to epoch start if no timestamp exists
 
+async def get_last_scrape_time(category: str) -> float:
+    """Get the timestamp of the last scrape for a category."""
+    timestamp_file = f"{DATA_DIR}/{category}/_last_scrape.txt"
+    return await asyncio.to_thread(_read_scrape_time, timestamp_file)
+
 async def update_last_scrape_time(category: str):
     """Update the timestamp of the last scrape for a category."""
     timestamp_file = f"{DATA_DIR}/{category}/_last_scrape.txt"
     
-    # Create directory if it doesn't exist
-    os.makedirs(f"{DATA_DIR}/{category}", exist_ok=True)
-    
     # Update timestamp
-    with open(timestamp_file, 'w') as f:
-        f.write(str(time.time()))
+    await asyncio.to_thread(_write_file, timestamp_file, str(time.time()).encode())
 
-async def scrape_wiki_page(url: str, browser=None) -> Dict[str, Any]:
-    """Scrape content from a wiki page."""
+async def scrape_wiki_page(url: str, page_obj: Page = None) -> Dict[str, Any]:
+    """Scrape content from a wiki page, loading it in page_obj."""
     try:
         full_url = f"{WIKI_BASE_URL}{url}"
-        page_obj = await browser.new_page()
         await page_obj.goto(full_url)
         await page_obj.wait_for_load_state("networkidle")
         
         # Get page content
         content = await page_obj.content()
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml')
         
         # Extract page title
         title_element = soup.select_one("#firstHeading")
@@ -161,8 +163,6 @@ async def scrape_wiki_page(url: str, browser=None) -> Dict[str, Any]:
         # Extract page content
         content_element = soup.select_one("#mw-content-text")
         if not content_element:
-            # Close the page
-            await page_obj.close()
             return None
         
         # Remove navigation, tables of contents, and citation elements
@@ -229,9 +229,6 @@ async def scrape_wiki_page(url: str, browser=None) -> Dict[str, Any]:
             if category_name:
                 categories.append(category_name)
         
-        # Close the page
-        await page_obj.close()
-        
         # Create the document
         timestamp = time.time()
         doc_id = url.strip('/').replace('/', '_')
@@ -251,13 +248,13 @@ async def scrape_wiki_page(url: str, browser=None) -> Dict[str, Any]:
         # Create a document structure for indexing
         indexable_document = {
             "id": doc_id,
-            "text": f"""
-                # {title}
-                
-                {text_content}
-                
-                Categories: {', '.join(categories)}
-            """,
+            "text": "\n".join([
+                f"# {title}",
+                "",
+                text_content,
+                "",
+                f"Categories: {', '.join(categories)}",
+            ]),
             "metadata": document,
             "source": full_url,
             "type": "wiki_page"
@@ -269,17 +266,16 @@ async def scrape_wiki_page(url: str, browser=None) -> Dict[str, Any]:
         logger.error(f"Error scraping wiki page {url}: {e}")
         return None
 
-async def scrape_category_links(category_url: str, browser=None) -> List[str]:
-    """Scrape links from a category page."""
+async def scrape_category_links(category_url: str, page_obj: Page = None) -> List[str]:
+    """Scrape links from a category page, loading it in page_obj."""
     try:
         full_url = f"{WIKI_BASE_URL}{category_url}"
-        page_obj = await browser.new_page()
         await page_obj.goto(full_url)
         await page_obj.wait_for_load_state("networkidle")
         
         # Get page content
         content = await page_obj.content()
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml')
         
         # Extract links from the category page
         links = []
@@ -288,16 +284,13 @@ async def scrape_category_links(category_url: str, browser=None) -> List[str]:
             if href and href.startswith('/'):
                 links.append(href)
         
-        # Close the page
-        await page_obj.close()
-        
         return links
         
     except Exception as e:
         logger.error(f"Error scraping category links from {category_url}: {e}")
         return []
 
-async def get_all_wiki_links(browser=None) -> List[str]:
+async def get_all_wiki_links(page_obj: Page = None) -> List[str]:
     """Get all wiki page links by exploring categories."""
     all_links = set()
     
@@ -312,7 +305,7 @@ async def get_all_wiki_links(browser=None) -> List[str]:
         
         for category_page in category_pages:
             # Get links from the category page
-            links = await scrape_category_links(category_page, browser)
+            links = await scrape_category_links(category_page, page_obj)
             for link in links:
                 all_links.add(link)
         
@@ -328,7 +321,7 @@ async def get_all_wiki_links(browser=None) -> List[str]:
         logger.error(f"Error getting wiki links: {e}")
         return list(all_links)  # Return what we have so far
 
-async def process_category(category: str, urls: List[str], browser=None, force_full: bool = False):
+async def process_category(category: str, urls: List[str], page_obj: Page = None, force_full: bool = False):
     """Process a category of wiki pages."""
     try:
         # Create category directory
@@ -347,7 +340,7 @@ async def process_category(category: str, urls: List[str], browser=None, force_f
         
         # Process each URL
         for url in urls:
-            document = await scrape_wiki_page(url, browser)
+            document = await scrape_wiki_page(url, page_obj)
             if document:
                 # Save individual document
                 doc_id = url.strip('/').replace('/', '_')
@@ -379,16 +372,19 @@ async def scrape_ashes_wiki(force_full: bool = False):
         # Initialize playwright
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
+            # Pages are scraped one at a time, so a single tab is reused for every
+            # navigation instead of opening and closing one per page
+            page_obj = await browser.new_page()
             
             # Get all wiki links
             # For a more targeted approach, we'll use our predefined categories
-            # all_links = await get_all_wiki_links(browser)
+            # all_links = await get_all_wiki_links(page_obj)
             
             all_documents = []
             
             # Process each category
             for category, urls in CATEGORIES.items():
-                category_docs = await process_category(category, urls, browser, force_full)
+                category_docs = await process_category(category, urls, page_obj, force_full)
                 all_documents.extend(category_docs)
             
             # Close browser
@@ -0,0 +1,6 @@
+"""Pytest configuration for the data pipeline."""
+import os
+import sys
+
+# The pipeline modules import each other as top-level modules (from config import settings)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
@@ -0,0 +1,40 @@
+"""Tests for reading settings from the environment."""
+import pytest
+
+from config import Settings, parse_bool
+
+
+class TestFromEnv:
+    """Tests for Settings.from_env."""
+    
+    def test_every_field_is_overridable(self, monkeypatch, tmp_path):
+        """Fields are read from the environment and converted by their annotated type."""
+        monkeypatch.setenv("DATA_DIR", "/srv/data")
+        monkeypatch.setenv("EMBEDDING_DIMENSION", "768")
+        monkeypatch.setenv("REQUEST_DELAY", "0.25")
+        monkeypatch.setenv("EMBEDDING_INT8", "yes")
+        monkeypatch.setenv("GAME_SERVERS", "Alpha-2,Beta-1")
+        monkeypatch.delenv("MILVUS_PORT", raising=False)
+        
+        settings = Settings.from_env(str(tmp_path / ".env"))
+        
+        assert settings.DATA_DIR == "/srv/data"
+        assert settings.EMBEDDING_DIMENSION == 768
+        assert settings.REQUEST_DELAY == 0.25
+        assert settings.EMBEDDING_INT8 is True
+        assert settings.GAME_SERVERS == ("Alpha-2", "Beta-1")
+        assert settings.MILVUS_PORT == 19530
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1", True),
+    ("true", True),
+    ("YES", True),
+    (" True ", True),
+    ("0", False),
+    ("false", False),
+    ("no", False),
+    ("", False),
+])
+def test_parse_bool(value, expected):
+    assert parse_bool(value) is expected
@@ -0,0 +1,115 @@
+"""Tests for indexing documents into Milvus."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from config import settings
+from indexers import vector_indexer
+from schemas import Document, DocumentMetadata
+
+FIELDS = ["id", "text", "metadata", "source", "type", "server", "content_hash", "embedding"]
+LEGACY_FIELDS = [name for name in FIELDS if name != "content_hash"]
+
+
+def make_document(doc_id: str, text: str) -> Document:
+    return Document(
+        id=doc_id,
+        text=text,
+        metadata=DocumentMetadata(
+            id=doc_id,
+            type="item",
+            source=f"https://example.com/{doc_id}",
+            timestamp="2026-01-01T00:00:00",
+        ),
+    )
+
+
+@pytest.fixture
+def make_collection(monkeypatch):
+    """Patch the indexer to use a mock, already indexed collection with the given fields."""
+    def _make_collection(field_names):
+        collection = MagicMock()
+        collection.schema.fields = [SimpleNamespace(name=name) for name in field_names]
+        collection.has_index.return_value = True
+        collection.num_entities = 10
+        
+        monkeypatch.setattr(vector_indexer, "_ensure_connected", lambda: None)
+        monkeypatch.setattr(vector_indexer, "_get_collection", lambda: collection)
+        monkeypatch.setattr(vector_indexer, "_load_collection", lambda: collection)
+        monkeypatch.setattr(
+            vector_indexer,
+            "generate_embeddings",
+            lambda texts: np.zeros((len(texts), settings.EMBEDDING_DIMENSION), dtype=np.float32),
+        )
+        return collection
+    
+    return _make_collection
+
+
+class TestIndexDocuments:
+    """Tests for index_documents."""
+    
+    def test_skips_unchanged_documents(self, make_collection, monkeypatch):
+        """Only new documents and documents whose text changed under the same ID are re-embedded."""
+        collection = make_collection(FIELDS)
+        documents = [
+            make_document("a", "unchanged text"),
+            make_document("b", "edited text"),
+            make_document("c", "new text"),
+        ]
+        monkeypatch.setattr(
+            vector_indexer,
+            "_indexed_hashes",
+            lambda _collection, ids: {
+                "a": vector_indexer.content_hash("unchanged text"),
+                "b": vector_indexer.content_hash("original text"),
+            },
+        )
+        
+        asyncio.run(vector_indexer.index_documents(documents))
+        
+        columns = collection.upsert.call_args.args[0]
+        assert len(columns) == len(FIELDS)
+        assert columns[0] == ["b", "c"]
+        assert columns[FIELDS.index("content_hash")] == [
+            vector_indexer.content_hash("edited text"),
+            vector_indexer.content_hash("new text"),
+        ]
+    
+    def test_collection_without_content_hash(self, make_collection, monkeypatch):
+        """A collection created before content_hash existed is upserted without it."""
+        collection = make_collection(LEGACY_FIELDS)
+        
+        def fail_indexed_hashes(_collection, ids):
+            raise AssertionError("content_hash queried on a collection without the field")
+        
+        monkeypatch.setattr(vector_indexer, "_indexed_hashes", fail_indexed_hashes)
+        documents = [make_document("a", "some text"), make_document("b", "other text")]
+        
+        asyncio.run(vector_indexer.index_documents(documents))
+        
+        columns = collection.upsert.call_args.args[0]
+        assert len(columns) == len(LEGACY_FIELDS)
+        assert columns[0] == ["a", "b"]
+        assert columns[-1].shape == (2, settings.EMBEDDING_DIMENSION)
+
+
+class TestGetSearchParams:
+    """Tests for get_search_params."""
+    
+    def test_uses_existing_index_metric(self):
+        """An index built with another metric and type is searched with its own parameters."""
+        collection = MagicMock()
+        collection.indexes = [SimpleNamespace(params={
+            "index_type": "HNSW",
+            "metric_type": "COSINE",
+            "params": {"M": 8, "efConstruction": 64},
+        })]
+        
+        assert vector_indexer.get_search_params(collection) == {
+            "metric_type": "COSINE",
+            "params": vector_indexer.INDEX_PARAMS["HNSW"][1],
+        }